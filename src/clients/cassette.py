@@ -0,0 +1,219 @@
+"""Record / replay cassettes for every outbound HTTP call (OpenAI, Tavily, web loaders)"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+MODES = ("off", "record", "replay")
+
+# stored bodies are already decoded, so these would no longer be true
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+class CassetteMiss(RuntimeError):
+    """Replay mode found no recorded response for a request"""
+
+
+def request_key(method: str, url: str, body: Union[bytes, str, None]) -> str:
+    """Stable key for a request; headers (incl. API keys) are never part of it"""
+    if body is None:
+        body = b""
+    elif isinstance(body, str):
+        body = body.encode("utf-8")
+    h = hashlib.sha256()
+    h.update(method.upper().encode())
+    h.update(b" ")
+    h.update(url.encode())
+    h.update(b"\n")
+    h.update(body)
+    return h.hexdigest()
+
+
+class Cassette:
+    """
+    Compact on-disk store of request/response pairs (sqlite, zlib bodies)
+
+    record: calls go out and responses are stored
+    replay: responses are served from the store with zero network,
+            optionally sleeping `latency_scale` x the recorded latency
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        mode: str = "replay",
+        latency_scale: float = 0.0,
+    ):
+        if mode not in MODES or mode == "off":
+            raise ValueError(f"Unsupported cassette mode: {mode}. Use 'record' or 'replay'.")
+
+        self.path = Path(path)
+        self.mode = mode
+        self.latency_scale = latency_scale
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS calls ("
+            " key TEXT PRIMARY KEY,"
+            " url TEXT,"
+            " status INTEGER,"
+            " headers TEXT,"
+            " body BLOB,"
+            " elapsed REAL)"
+        )
+        self._db.commit()
+
+        # counters
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def get(self, key: str) -> Tuple[int, dict, bytes]:
+        """Recorded (status, headers, body) for a key; raises CassetteMiss"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, headers, body, elapsed FROM calls WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if row is None:
+            raise CassetteMiss(
+                f"No recorded response in {self.path} for request {key[:12]}; "
+                "re-run in record mode to capture it"
+            )
+
+        status, headers, body, elapsed = row
+        if self.latency_scale > 0:
+            time.sleep(elapsed * self.latency_scale)
+        return status, json.loads(headers), zlib.decompress(body)
+
+    def put(self, key: str, url: str, status: int, headers: dict, body: bytes, elapsed: float):
+        """Store one response (latest recording wins)"""
+        headers = {k: v for k, v in headers.items() if k.lower() not in _DROP_HEADERS}
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO calls VALUES (?, ?, ?, ?, ?, ?)",
+                (key, url, status, json.dumps(headers), zlib.compress(body), elapsed),
+            )
+            self._db.commit()
+            self.recorded += 1
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "recorded": self.recorded,
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class CassetteTransport(httpx.BaseTransport):
+    """httpx transport (OpenAI chat + embeddings) backed by a cassette"""
+
+    def __init__(self, cassette: Cassette, inner: httpx.BaseTransport):
+        self.cassette = cassette
+        self.inner = inner
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key = request_key(request.method, str(request.url), request.read())
+
+        if self.cassette.replaying:
+            try:
+                status, headers, body = self.cassette.get(key)
+            except CassetteMiss as miss:
+                # raised here, the OpenAI SDK would report a retryable
+                # "Connection error." and drop the hint; a 404 with the
+                # message as the API error body fails once and keeps it
+                return httpx.Response(
+                    404,
+                    headers={"x-should-retry": "false"},
+                    json={"error": {"message": str(miss), "type": "cassette_miss"}},
+                    request=request,
+                )
+            return httpx.Response(status, headers=headers, content=body, request=request)
+
+        start = time.perf_counter()
+        response = self.inner.handle_request(request)
+        body = response.read()
+        elapsed = time.perf_counter() - start
+
+        self.cassette.put(key, str(request.url), response.status_code, dict(response.headers), body, elapsed)
+        return httpx.Response(
+            response.status_code,
+            headers={k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS},
+            content=body,
+            request=request,
+        )
+
+    def close(self):
+        self.inner.close()
+
+
+class CassetteAdapter(HTTPAdapter):
+    """requests adapter (Tavily, WebBaseLoader) backed by a cassette"""
+
+    def __init__(self, cassette: Cassette, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        key = request_key(request.method, request.url, request.body)
+
+        if self.cassette.replaying:
+            status, headers, body = self.cassette.get(key)
+            return self._build(request, status, headers, body)
+
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        body = response.content
+        elapsed = time.perf_counter() - start
+
+        self.cassette.put(key, request.url, response.status_code, dict(response.headers), body, elapsed)
+        return response
+
+    def _build(self, request, status: int, headers: dict, body: bytes) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = body
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.reason = "REPLAYED"
+        response.connection = self
+        return response
+
+
+def open_cassette(mode: str, path: Union[str, Path], latency_scale: float = 0.0) -> Optional[Cassette]:
+    """Cassette for the configured mode, or None when mode is 'off'"""
+    if mode not in MODES:
+        raise ValueError(f"Unsupported cassette mode: {mode}. Use one of {MODES}.")
+    if mode == "off":
+        return None
+    return Cassette(path, mode=mode, latency_scale=latency_scale)
@@ -0,0 +1,259 @@
+"""Shared, connection-pooled HTTP clients for every outbound provider"""
+
+import os
+import threading
+from typing import Dict, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from langchain_community.document_loaders.web_base import default_header_template
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from tavily import TavilyClient
+
+from src.clients.cassette import Cassette, CassetteAdapter, CassetteTransport
+from src.clients.scheduler import (
+    RateLimitScheduler,
+    ScheduledEmbeddings,
+    SchedulerCallback,
+)
+from src.serving.hedging import attempt_timeout
+
+
+class _InFlight:
+    """Counts requests currently on the wire for one provider"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.total = 0
+
+    def start(self):
+        with self._lock:
+            self.active += 1
+            self.total += 1
+            self.peak = max(self.peak, self.active)
+
+    def finish(self):
+        with self._lock:
+            self.active -= 1
+
+
+class _CountingTransport(httpx.HTTPTransport):
+    """
+    httpx transport that tracks in-flight requests, including failures
+
+    Inside a hedged attempt every request (SDK retries included) is
+    capped at the attempt's remaining time, so abandoned attempts don't
+    keep a connection busy for the client's full timeout.
+    """
+
+    def __init__(self, inflight: _InFlight, **kwargs):
+        super().__init__(**kwargs)
+        self.inflight = inflight
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        left = attempt_timeout()
+        if left is not None:
+            if left <= 0:
+                raise httpx.TimeoutException("Hedged attempt deadline passed", request=request)
+            timeouts = request.extensions.get("timeout") or {}
+            request.extensions["timeout"] = {
+                key: left if timeouts.get(key) is None else min(timeouts[key], left)
+                for key in ("connect", "read", "write", "pool")
+            }
+
+        self.inflight.start()
+        try:
+            return super().handle_request(request)
+        finally:
+            self.inflight.finish()
+
+
+def _mount_pool(
+    session: requests.Session,
+    pool_size: int,
+    cassette: Optional[Cassette] = None,
+) -> requests.Session:
+    """Mount a keep-alive pool sized for concurrent calls (cassette-backed if given)"""
+    if cassette is None:
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    else:
+        adapter = CassetteAdapter(
+            cassette, pool_connections=pool_size, pool_maxsize=pool_size
+        )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _session_stats(session: requests.Session) -> Dict[str, int]:
+    """Connection counts across the urllib3 pools of a session"""
+    opened = idle = 0
+    for adapter in session.adapters.values():
+        for key in adapter.poolmanager.pools.keys():
+            pool = adapter.poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            opened += pool.num_connections
+            idle += pool.pool.qsize() if pool.pool is not None else 0
+    return {"opened": opened, "idle": idle}
+
+
+class ClientRegistry:
+    """
+    One pooled HTTP client per provider, shared by every caller
+
+    OpenAI chat + embeddings share an httpx.Client (keep-alive, HTTP pool);
+    Tavily and web loaders share pooled requests.Sessions. LLM instances
+    are cached per call type so each can carry its own timeout while
+    reusing the same connections.
+
+    With a cassette every provider records to / replays from it at the
+    HTTP layer; replay needs no API keys and no network.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        model: str,
+        timeouts: Dict[str, float],
+        pool_size: int = 20,
+        keepalive: int = 10,
+        keepalive_expiry: float = 30.0,
+        chat_scheduler: Optional[RateLimitScheduler] = None,
+        embed_scheduler: Optional[RateLimitScheduler] = None,
+        cassette: Optional[Cassette] = None,
+    ):
+        self.cassette = cassette
+        # replayed calls never reach the provider, any key will do
+        if not api_key and cassette is not None and cassette.replaying:
+            api_key = "replay"
+        self.api_key = api_key
+        self.model = model
+        self.timeouts = timeouts
+        self.pool_size = pool_size
+        self.chat_scheduler = chat_scheduler
+        self.embed_scheduler = embed_scheduler
+
+        self._lock = threading.Lock()
+        self._llms: Dict[str, ChatOpenAI] = {}
+        self._embeddings = None
+        self._tavily: Optional[TavilyClient] = None
+
+        self._openai_inflight = _InFlight()
+        self._openai_transport = _CountingTransport(
+            self._openai_inflight,
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=keepalive,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+        transport = self._openai_transport
+        if cassette is not None:
+            transport = CassetteTransport(cassette, transport)
+        self.openai_http = httpx.Client(transport=transport)
+        self.web_session = _mount_pool(requests.Session(), pool_size, cassette)
+        # WebBaseLoader skips its own header setup when handed a session
+        headers = dict(default_header_template)
+        if not headers.get("User-Agent"):
+            headers["User-Agent"] = (
+                os.environ.get("USER_AGENT") or requests.utils.default_user_agent()
+            )
+        self.web_session.headers.update(headers)
+        self.web_session.verify = True
+
+    def timeout(self, call_type: str) -> float:
+        """Timeout in seconds for a call type (falls back to 'default')"""
+        return self.timeouts.get(call_type, self.timeouts["default"])
+
+    def llm(self, call_type: str = "default") -> ChatOpenAI:
+        """Chat model for a call type, sharing the pooled OpenAI connection"""
+        if not self.api_key:
+            raise ValueError("OPENAI_API_KEY not found in environment")
+
+        with self._lock:
+            if call_type not in self._llms:
+                self._llms[call_type] = ChatOpenAI(
+                    model=self.model,
+                    api_key=self.api_key,
+                    temperature=0,
+                    timeout=self.timeout(call_type),
+                    http_client=self.openai_http,
+                    callbacks=(
+                        [SchedulerCallback(self.chat_scheduler)]
+                        if self.chat_scheduler is not None else None
+                    ),
+                )
+            return self._llms[call_type]
+
+    def embeddings(self):
+        """Embedding model sharing the pooled OpenAI connection"""
+        with self._lock:
+            if self._embeddings is None:
+                embeddings = OpenAIEmbeddings(
+                    api_key=self.api_key,
+                    timeout=self.timeout("embed"),
+                    http_client=self.openai_http,
+                    # tiktoken chunking fetches its vocab over the network;
+                    # send raw text so cassettes stay offline and stable
+                    check_embedding_ctx_length=self.cassette is None,
+                )
+                if self.embed_scheduler is not None:
+                    embeddings = ScheduledEmbeddings(embeddings, self.embed_scheduler)
+                self._embeddings = embeddings
+            return self._embeddings
+
+    def tavily(self, api_key: Optional[str]) -> TavilyClient:
+        """Tavily client whose session uses a pooled keep-alive adapter"""
+        with self._lock:
+            if self._tavily is None:
+                if not api_key and self.cassette is not None and self.cassette.replaying:
+                    api_key = "replay"
+                client = TavilyClient(api_key=api_key)
+                _mount_pool(client.session, self.pool_size, self.cassette)
+                self._tavily = client
+            return self._tavily
+
+    def congested(self) -> bool:
+        """True while any call is queued behind the provider rate limits"""
+        return any(
+            scheduler is not None and scheduler.waiting > 0
+            for scheduler in (self.chat_scheduler, self.embed_scheduler)
+        )
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Pool utilisation per provider"""
+        openai_stats = {
+            "active": self._openai_inflight.active,
+            "peak": self._openai_inflight.peak,
+            "requests": self._openai_inflight.total,
+            "max_connections": self.pool_size,
+        }
+        pool = getattr(self._openai_transport, "_pool", None)
+        if pool is not None:
+            conns = list(pool.connections)
+            openai_stats["opened"] = len(conns)
+            openai_stats["idle"] = sum(1 for c in conns if c.is_idle())
+
+        stats = {"openai": openai_stats, "web": _session_stats(self.web_session)}
+        if self._tavily is not None:
+            stats["tavily"] = _session_stats(self._tavily.session)
+        if self.chat_scheduler is not None:
+            stats["chat_scheduler"] = self.chat_scheduler.stats()
+        if self.embed_scheduler is not None:
+            stats["embed_scheduler"] = self.embed_scheduler.stats()
+        if self.cassette is not None:
+            stats["cassette"] = self.cassette.stats()
+        return stats
+
+    def close(self):
+        """Close every pooled connection"""
+        self.openai_http.close()
+        self.web_session.close()
+        if self._tavily is not None:
+            self._tavily.close()
+        if self.cassette is not None:
+            self.cassette.close()
@@ -0,0 +1,231 @@
+"""Admission control and token-bucket scheduling for outbound LLM / embedding calls"""
+
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.embeddings import Embeddings
+
+from src.serving.hedging import DeadlineExceeded, attempt_timeout
+
+
+# lower value == served first
+PRIORITIES = {"interactive": 0, "eval": 1, "ingest": 2}
+
+_priority = contextvars.ContextVar("llm_priority", default="interactive")
+
+
+@contextmanager
+def priority_scope(name: str):
+    """Run the enclosed LLM / embedding calls at the given priority"""
+    if name not in PRIORITIES:
+        raise ValueError(f"Unknown priority: {name}. Use one of {list(PRIORITIES)}")
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough prompt token estimate (~4 characters per token)"""
+    return max(1, len(text) // 4)
+
+
+class AdmissionError(RuntimeError):
+    """Raised when the scheduler queue is full or a wait exceeds its timeout"""
+
+
+class TokenBucket:
+    """Continuously refilling bucket (capacity per minute)"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` is available (0 if available now)"""
+        # requests larger than the bucket only wait for a full bucket
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        self.level -= min(amount, self.capacity)
+
+
+class RateLimitScheduler:
+    """
+    Shared gate in front of a provider's RPM / TPM limits
+
+    Callers queue by priority (interactive before eval before ingest);
+    the head of the queue is admitted once both the request and token
+    buckets can cover it. When the queue is full the newest waiter of
+    the lowest priority is evicted to make room for a more urgent call;
+    if nothing queued is less urgent, the new caller fails fast. Either
+    way the loser gets AdmissionError instead of piling up behind a 429
+    storm. Inside a hedged attempt the wait is also capped at the
+    attempt's deadline: a call that can't be admitted in time raises
+    DeadlineExceeded without consuming any quota.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rpm: float,
+        tpm: float,
+        max_queue: int = 64,
+        max_wait: Optional[float] = 30.0,
+    ):
+        self.name = name
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+
+        self._cond = threading.Condition()
+        self._queue: List[tuple] = []
+        self._evicted = set()
+        self._seq = itertools.count()
+
+        # counters
+        self.admitted = 0
+        self.rejected = 0
+        self.expired = 0
+
+    def acquire(self, tokens: int, priority: Optional[str] = None):
+        """Block until the call may go out, or raise AdmissionError"""
+        priority = priority or _priority.get()
+        entry = (PRIORITIES[priority], next(self._seq))
+        deadline = None if self.max_wait is None else time.monotonic() + self.max_wait
+        left = attempt_timeout()
+        attempt_end = None if left is None else time.monotonic() + left
+
+        with self._cond:
+            if len(self._queue) >= self.max_queue:
+                worst = max(self._queue)
+                if worst[0] <= entry[0]:
+                    self.rejected += 1
+                    raise AdmissionError(
+                        f"{self.name} scheduler queue full ({self.max_queue} waiting); "
+                        "rejecting call instead of exceeding provider rate limits"
+                    )
+                # make room: the evicted waiter raises when it wakes up
+                self._queue.remove(worst)
+                heapq.heapify(self._queue)
+                self._evicted.add(worst)
+                self._cond.notify_all()
+            heapq.heappush(self._queue, entry)
+
+            try:
+                while True:
+                    if entry in self._evicted:
+                        self._evicted.discard(entry)
+                        self.rejected += 1
+                        raise AdmissionError(
+                            f"{self.name} scheduler queue full; {priority} call "
+                            "evicted for a higher-priority one"
+                        )
+
+                    now = time.monotonic()
+                    self.requests.refill(now)
+                    self.tokens.refill(now)
+
+                    wait = 0.0
+                    if self._queue[0] == entry:
+                        wait = max(
+                            self.requests.wait_time(1),
+                            self.tokens.wait_time(tokens),
+                        )
+                        if wait == 0.0 and (attempt_end is None or now < attempt_end):
+                            self.requests.take(1)
+                            self.tokens.take(tokens)
+                            self.admitted += 1
+                            return
+                    else:
+                        wait = 0.05
+                        if attempt_end is not None:
+                            wait = min(wait, max(attempt_end - now, 0.0))
+
+                    # the hedged attempt this call belongs to has given up
+                    if attempt_end is not None and now + wait >= attempt_end:
+                        self.expired += 1
+                        raise DeadlineExceeded(
+                            f"{self.name} scheduler could not admit call before "
+                            f"the attempt deadline ({priority} priority)"
+                        )
+
+                    if deadline is not None and now + wait > deadline:
+                        self.rejected += 1
+                        raise AdmissionError(
+                            f"{self.name} scheduler could not admit call within "
+                            f"{self.max_wait:.0f}s ({priority} priority)"
+                        )
+                    self._cond.wait(timeout=wait)
+            finally:
+                if entry in self._queue:
+                    self._queue.remove(entry)
+                    heapq.heapify(self._queue)
+                self._cond.notify_all()
+
+    @property
+    def waiting(self) -> int:
+        """Calls currently queued for admission"""
+        with self._cond:
+            return len(self._queue)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "queued": len(self._queue),
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "expired": self.expired,
+                "request_bucket": round(self.requests.level, 1),
+                "token_bucket": round(self.tokens.level, 1),
+            }
+
+
+class SchedulerCallback(BaseCallbackHandler):
+    """Gates every chat model call (incl. inside the ReAct agent) on the scheduler"""
+
+    raise_error = True
+    run_inline = True
+
+    def __init__(self, scheduler: RateLimitScheduler, max_output_tokens: int = 512):
+        self.scheduler = scheduler
+        self.max_output_tokens = max_output_tokens
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        text = "".join(
+            str(m.content) for batch in messages for m in batch
+        )
+        self.scheduler.acquire(estimate_tokens(text) + self.max_output_tokens)
+
+
+class ScheduledEmbeddings(Embeddings):
+    """Embeddings wrapper that passes every call through the scheduler"""
+
+    def __init__(self, embeddings: Embeddings, scheduler: RateLimitScheduler):
+        self.embeddings = embeddings
+        self.scheduler = scheduler
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.scheduler.acquire(sum(estimate_tokens(t) for t in texts))
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        self.scheduler.acquire(estimate_tokens(text))
+        return self.embeddings.embed_query(text)
@@ -1,9 +1,17 @@
 """Configuration module for Agentic RAG system"""
 
 import os
+import threading
 from dotenv import load_dotenv
+from pathlib import Path
 from langchain_openai import ChatOpenAI
 
+from src.clients.cassette import open_cassette
+from src.clients.registry import ClientRegistry
+from src.clients.scheduler import RateLimitScheduler
+from src.serving.hedging import Hedger
+from src.router.learned_router import LearnedRouter, RouteLogger
+
 # Load environment variables
 load_dotenv()
 
@@ -13,6 +21,7 @@ class Config:
 
     # API Keys
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
 
     # Model Configuration
     LLM_MODEL = "gpt-4o"
@@ -21,6 +30,61 @@ class Config:
     CHUNK_SIZE = 500
     CHUNK_OVERLAP = 50
 
+    # Web route: ranked chunks passed to the answer prompt
+    WEB_CONTEXT_TOKEN_BUDGET = 1500
+    WEB_INDEX_TTL = 600.0
+
+    # Per-request latency budget and hedging (seconds)
+    REQUEST_BUDGET = 30.0
+    ANSWER_RESERVE = 8.0
+    HEDGE_DEFAULT_DELAY = 3.0
+    HEDGE_QUANTILE = 95.0
+    HEDGE_MAX_WORKERS = 32
+
+    # Background warm-up: sources indexed per published snapshot
+    WARMUP_BATCH_SIZE = 1
+
+    # Multi-process serving from one read-only mmap index
+    SERVING_INDEX_DIR = "data/serving_index"
+    SERVING_WORKERS = int(os.getenv("RAG_SERVING_WORKERS", "0"))
+
+    # HTTP connection pools (shared per provider)
+    HTTP_POOL_SIZE = 20
+    HTTP_KEEPALIVE = 10
+    HTTP_KEEPALIVE_EXPIRY = 30.0
+
+    # Timeouts per call type (seconds)
+    TIMEOUTS = {
+        "default": 60.0,
+        "judge": 15.0,
+        "answer": 60.0,
+        "embed": 30.0,
+        "search": 20.0,
+        "loader": 15.0,
+    }
+
+    # Provider rate limits (admission control for every LLM / embedding call)
+    LLM_RPM = 500
+    LLM_TPM = 30000
+    EMBED_RPM = 3000
+    EMBED_TPM = 1000000
+    SCHEDULER_MAX_QUEUE = 64
+    SCHEDULER_MAX_WAIT = 30.0
+
+    # Record / replay of outbound HTTP calls: off | record | replay
+    CASSETTE_MODE = os.getenv("RAG_CASSETTE_MODE", "off")
+    CASSETTE_PATH = os.getenv("RAG_CASSETTE_PATH", "data/cassettes/default.sqlite")
+    CASSETTE_LATENCY_SCALE = float(os.getenv("RAG_CASSETTE_LATENCY_SCALE", "0"))
+
+    _clients = None
+    _clients_lock = threading.Lock()
+    _hedger = None
+
+    # Learned router (distilled from judge_docs decisions)
+    ROUTER_LOG_PATH = "data/router/decisions.jsonl"
+    ROUTER_MODEL_PATH = "data/router/router.npz"
+    ROUTER_CONFIDENCE = 0.9
+
     # Default URLs
     DEFAULT_URLS = [
         "https://lilianweng.github.io/posts/2023-06-23-agent/",
@@ -28,14 +92,74 @@ class Config:
     ]
 
     @classmethod
-    def get_llm(cls):
-        """Initialize and return the LLM model"""
+    def get_clients(cls) -> ClientRegistry:
+        """Process-wide registry of pooled provider clients"""
+
+        with cls._clients_lock:
+            if cls._clients is None:
+                cls._clients = ClientRegistry(
+                    api_key=cls.OPENAI_API_KEY,
+                    model=cls.LLM_MODEL,
+                    timeouts=cls.TIMEOUTS,
+                    pool_size=cls.HTTP_POOL_SIZE,
+                    keepalive=cls.HTTP_KEEPALIVE,
+                    keepalive_expiry=cls.HTTP_KEEPALIVE_EXPIRY,
+                    chat_scheduler=RateLimitScheduler(
+                        "chat",
+                        rpm=cls.LLM_RPM,
+                        tpm=cls.LLM_TPM,
+                        max_queue=cls.SCHEDULER_MAX_QUEUE,
+                        max_wait=cls.SCHEDULER_MAX_WAIT,
+                    ),
+                    embed_scheduler=RateLimitScheduler(
+                        "embeddings",
+                        rpm=cls.EMBED_RPM,
+                        tpm=cls.EMBED_TPM,
+                        max_queue=cls.SCHEDULER_MAX_QUEUE,
+                        max_wait=cls.SCHEDULER_MAX_WAIT,
+                    ),
+                    cassette=open_cassette(
+                        cls.CASSETTE_MODE,
+                        cls.CASSETTE_PATH,
+                        cls.CASSETTE_LATENCY_SCALE,
+                    ),
+                )
+            return cls._clients
 
-        if not cls.OPENAI_API_KEY:
-            raise ValueError("OPENAI_API_KEY not found in environment")
+    @classmethod
+    def get_hedger(cls) -> Hedger:
+        """Process-wide hedger (latency history shared by every graph)"""
+
+        with cls._clients_lock:
+            if cls._hedger is None:
+                cls._hedger = Hedger(
+                    max_workers=cls.HEDGE_MAX_WORKERS,
+                    quantile=cls.HEDGE_QUANTILE,
+                    default_delay=cls.HEDGE_DEFAULT_DELAY,
+                    # don't duplicate calls that are only waiting for quota
+                    congested=lambda: cls._clients is not None and cls._clients.congested(),
+                )
+            return cls._hedger
+
+    @classmethod
+    def get_llm(cls, call_type: str = "default") -> ChatOpenAI:
+        """Return the shared LLM model for a call type (see TIMEOUTS)"""
+
+        return cls.get_clients().llm(call_type)
+
+    @classmethod
+    def get_router(cls):
+        """Load the distilled router if one has been trained, else None"""
+
+        if not Path(cls.ROUTER_MODEL_PATH).exists():
+            return None
+
+        router = LearnedRouter.load(cls.ROUTER_MODEL_PATH)
+        router.confidence = cls.ROUTER_CONFIDENCE
+        return router
+
+    @classmethod
+    def get_route_logger(cls):
+        """Logger that records LLM judge decisions for router training"""
 
-        return ChatOpenAI(
-            model=cls.LLM_MODEL,
-            api_key=cls.OPENAI_API_KEY,
-            temperature=0,
-        )
+        return RouteLogger(cls.ROUTER_LOG_PATH)
@@ -5,19 +5,21 @@ from langchain_community.document_loaders import WebBaseLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
 
-from typing import List, Union
+from typing import Iterator, List, Tuple, Union
 from pathlib import Path
 from langchain_community.document_loaders import (
     WebBaseLoader,
     PyPDFLoader,
-    TextLoader,
-    PyPDFDirectoryLoader
+    TextLoader
 )
+from src.config.config import Config
+from src.doc_ingestion.pdf_extractor import ParallelPDFExtractor
+from src.doc_ingestion.span_splitter import Span, SpanSplitter
 
 
 class DocumentProcessor:
     """Handles document leading and processing"""
-    def __init__(self,chunk_size=500,chunk_overlap: int=50):
+    def __init__(self,chunk_size=500,chunk_overlap: int=50,pdf_extractor: ParallelPDFExtractor=None):
 
         """
         Docstring for __init__ to initialise doc processor
@@ -26,6 +28,7 @@ class DocumentProcessor:
         :param chunk_size: size of text chunks
         :param chunk_overlap: Overlap betweeen chunks
         :type chunk_overlap: int
+        :param pdf_extractor: page-parallel, cached PDF extractor
         """
 
         self.chunk_size=chunk_size
@@ -34,16 +37,24 @@ class DocumentProcessor:
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap
         )
+        self.pdf_extractor=pdf_extractor or ParallelPDFExtractor()
+        self.span_splitter=SpanSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap
+        )
 
     def load_from_url(self,url:str)->List[Document]:
         """load documents from urls"""
-        loader=WebBaseLoader(url)
+        loader=WebBaseLoader(
+            url,
+            session=Config.get_clients().web_session,
+            requests_kwargs={"timeout": Config.TIMEOUTS["loader"]},
+        )
         return loader.load()
     
     def load_from_pdf_dir(self, directory: Union[str, Path]) -> List[Document]:
         """Load documents from all PDFs inside a directory"""
-        loader = PyPDFDirectoryLoader(str(directory))
-        return loader.load()
+        return self.pdf_extractor.load_dir(directory)
 
     def load_from_txt(self, file_path: Union[str, Path]) -> List[Document]:
         """Load document(s) from a TXT file"""
@@ -52,8 +63,11 @@ class DocumentProcessor:
 
     def load_from_pdf(self, file_path: Union[str, Path]) -> List[Document]:
         """Load document(s) from a PDF file"""
-        loader = PyPDFDirectoryLoader(str("data"))
-        return loader.load()
+        return self.pdf_extractor.load([file_path])
+
+    def iter_pdf_pages(self, paths: List[Union[str, Path]]) -> Iterator[Document]:
+        """Stream PDF pages as they are extracted (unchanged pages come from cache)"""
+        return self.pdf_extractor.iter_pages(paths)
     
     def load_documents(self,sources:List[str])-> List[Document]:
         
@@ -95,6 +109,18 @@ class DocumentProcessor:
             List of split documents
         """
         return self.splitter.split_documents(documents)
+
+    def split_spans(self, documents: List[Document]) -> List[Span]:
+        """
+        Split documents into (doc_id, start, end) spans without copying text
+
+        Args:
+            documents: List of documents to split
+
+        Returns:
+            List of spans over documents[doc_id].page_content
+        """
+        return self.span_splitter.split_documents(documents)
     
     def process_urls(self, urls: List[str]) -> List[Document]:
         """
@@ -110,6 +136,13 @@ class DocumentProcessor:
 
         return split_docs
 
+    def process_urls_to_spans(self, urls: List[str]) -> Tuple[List[Document], List[Span]]:
+        """
+        Load documents and split them into spans (chunk text is sliced lazily)
+        """
+        docs = self.load_documents(urls)
+        return docs, self.split_spans(docs)
+
 
         
 
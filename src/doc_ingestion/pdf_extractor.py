@@ -0,0 +1,147 @@
+"""Page-parallel PDF extraction with a per-page text cache"""
+
+import hashlib
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+from langchain_core.documents import Document
+from pypdf import PdfReader
+
+
+def file_hash(path: Union[str, Path], block_size: int = 1 << 20) -> str:
+    """sha256 of a file's bytes, read in blocks"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _scan(path: str) -> Tuple[str, int]:
+    """Worker: (file hash, page count) of one PDF"""
+    return file_hash(path), len(PdfReader(path).pages)
+
+
+def _extract_pages(path: str, pages: List[int]) -> List[Tuple[int, str]]:
+    """Worker: extract text for the given page numbers of one PDF"""
+    reader = PdfReader(path)
+    return [(p, reader.pages[p].extract_text() or "") for p in pages]
+
+
+class PageCache:
+    """On-disk cache of extracted text keyed by (file hash, page)"""
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, digest: str, page: int) -> Path:
+        return self.cache_dir / digest / f"{page}.txt"
+
+    def get(self, digest: str, page: int) -> Optional[str]:
+        path = self._path(digest, page)
+        if not path.exists():
+            return None
+        return path.read_text(encoding="utf-8")
+
+    def put(self, digest: str, page: int, text: str):
+        path = self._path(digest, page)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+
+
+class ParallelPDFExtractor:
+    """Shards PDFs by file and page range across a process pool"""
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path] = "data/.pdf_cache",
+        max_workers: Optional[int] = None,
+        pages_per_shard: int = 16,
+    ):
+        """
+        :param cache_dir: where extracted page text is cached
+        :param max_workers: process pool size (defaults to CPU count)
+        :param pages_per_shard: pages handed to a worker per task
+        """
+        self.cache = PageCache(cache_dir)
+        self.max_workers = max_workers
+        self.pages_per_shard = pages_per_shard
+
+    def _document(self, path: Path, page: int, total: int, text: str) -> Document:
+        # same metadata keys as PyPDFLoader
+        return Document(
+            page_content=text,
+            metadata={"source": str(path), "page": page, "total_pages": total},
+        )
+
+    def iter_pages(self, paths: List[Union[str, Path]]) -> Iterator[Document]:
+        """
+        Yield one Document per page as soon as it is available
+
+        Files are hashed and page-counted in the workers too; as soon as a
+        file's scan returns, its cached pages are yielded and its missing
+        pages are queued as extraction shards, so pages stream out while
+        other files are still being scanned. Only about one scan per
+        worker is queued at a time so shards don't wait behind the whole
+        file list. Order is completion order (not page order).
+        """
+        pending_paths = iter(Path(p) for p in paths)
+        max_scans = self.max_workers or os.cpu_count() or 1
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            # future -> ("scan", path) or ("pages", path, digest, total)
+            tasks = {}
+            scans = 0
+
+            def top_up():
+                nonlocal scans
+                while scans < max_scans:
+                    path = next(pending_paths, None)
+                    if path is None:
+                        return
+                    tasks[pool.submit(_scan, str(path))] = ("scan", path)
+                    scans += 1
+
+            top_up()
+            while tasks:
+                done, _ = wait(tasks, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, path, *info = tasks.pop(future)
+
+                    if kind == "pages":
+                        digest, total = info
+                        for page, text in future.result():
+                            self.cache.put(digest, page, text)
+                            yield self._document(path, page, total, text)
+                        continue
+
+                    scans -= 1
+                    digest, total = future.result()
+                    missing = []
+                    for page in range(total):
+                        text = self.cache.get(digest, page)
+                        if text is None:
+                            missing.append(page)
+                        else:
+                            yield self._document(path, page, total, text)
+
+                    for i in range(0, len(missing), self.pages_per_shard):
+                        shard = missing[i:i + self.pages_per_shard]
+                        tasks[pool.submit(_extract_pages, str(path), shard)] = (
+                            "pages", path, digest, total
+                        )
+                    top_up()
+
+    def load(self, paths: List[Union[str, Path]]) -> List[Document]:
+        """Extract all pages, ordered by (source, page)"""
+        docs = list(self.iter_pages(paths))
+        docs.sort(key=lambda d: (d.metadata["source"], d.metadata["page"]))
+        return docs
+
+    def load_dir(self, directory: Union[str, Path]) -> List[Document]:
+        """Extract every PDF inside a directory"""
+        return self.load(sorted(Path(directory).glob("*.pdf")))
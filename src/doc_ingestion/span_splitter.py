@@ -0,0 +1,104 @@
+"""Offset-based text splitter: chunks are (doc_id, start, end) spans over the original text"""
+
+from typing import Iterator, List, NamedTuple
+
+from langchain_core.documents import Document
+
+
+class Span(NamedTuple):
+    """A chunk as offsets into documents[doc_id].page_content"""
+
+    doc_id: int
+    start: int
+    end: int
+
+
+class SpanSplitter:
+    """
+    Splits documents into spans without materializing chunk strings
+
+    Boundaries are snapped to the best separator inside the window
+    (paragraph, line, sentence, then whitespace) so a chunk never ends
+    or starts in the middle of a word token.
+    """
+
+    SEPARATORS = ("\n\n", "\n", ". ", " ")
+
+    def __init__(self, chunk_size: int = 500, chunk_overlap: int = 50):
+        if chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
+    def _cut(self, text: str, start: int, limit: int) -> int:
+        """Best end offset in (start, limit], searched without slicing"""
+        if limit >= len(text):
+            return len(text)
+
+        # don't accept a cut that leaves a tiny chunk
+        floor = start + self.chunk_size // 2
+        for sep in self.SEPARATORS:
+            pos = text.rfind(sep, floor, limit)
+            if pos != -1:
+                return pos + len(sep)
+        return limit
+
+    def _next_start(self, text: str, start: int, end: int) -> int:
+        """Start of the next span: end minus overlap, moved to a word boundary"""
+        if end >= len(text):
+            return len(text)
+
+        nxt = max(end - self.chunk_overlap, start + 1)
+        if nxt < end and not text[nxt - 1].isspace():
+            space = text.find(" ", nxt, end)
+            nxt = space + 1 if space != -1 else end
+        return nxt
+
+    def split_text(self, text: str, doc_id: int = 0) -> Iterator[Span]:
+        """Yield spans over a single text"""
+        n = len(text)
+        start = 0
+
+        # skip leading whitespace
+        while start < n and text[start].isspace():
+            start += 1
+
+        while start < n:
+            end = self._cut(text, start, start + self.chunk_size)
+            yield Span(doc_id, start, end)
+            start = self._next_start(text, start, end)
+            while start < n and text[start].isspace():
+                start += 1
+
+    def split_documents(self, documents: List[Document]) -> List[Span]:
+        """Spans for every document, doc_id is the index into documents"""
+        spans: List[Span] = []
+        for doc_id, doc in enumerate(documents):
+            spans.extend(self.split_text(doc.page_content, doc_id))
+        return spans
+
+
+def span_text(documents: List[Document], span: Span) -> str:
+    """Slice the chunk text of a span (only call when embedding or displaying)"""
+    return documents[span.doc_id].page_content[span.start:span.end]
+
+
+def span_metadata(documents: List[Document], span: Span) -> dict:
+    """Loader metadata of the span's document (source, title, page...) plus its offsets"""
+    return {
+        "source": "unknown",
+        **documents[span.doc_id].metadata,
+        "doc_id": span.doc_id,
+        "start": span.start,
+        "end": span.end,
+    }
+
+
+def expand_span(documents: List[Document], span: Span, window: int) -> Span:
+    """Widen a span by `window` characters on each side, clamped to its document"""
+    length = len(documents[span.doc_id].page_content)
+    return Span(
+        span.doc_id,
+        max(0, span.start - window),
+        min(length, span.end + window),
+    )
@@ -0,0 +1,365 @@
+"""
+Open-loop load generator for the end-to-end RAG graph
+
+Replays a question log against GraphBuilder.build() with Poisson
+arrivals (requests are sent on schedule whether or not earlier ones
+have finished) against stub LLM / embedding / Tavily backends with
+injected latency.
+
+Reports per arrival rate:
+- Throughput
+- p50 / p95 / p99 latency per route (docs vs web)
+- Saturation point (first rate the system cannot keep up with)
+
+Usage:
+    python -m src.eval.load_test --rates 1,2,4,8 --duration 30
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage
+
+from src.graph_builder.graph_builder import GraphBuilder
+from src.vectorstore.ephemeral_index import EphemeralWebIndex
+
+
+DEFAULT_QUESTIONS = [
+    "What is an AI agent?",
+    "What are diffusion models?",
+    "Who is Elon Musk?",
+    "How does task decomposition work for LLM agents?",
+    "What is video generation with diffusion models?",
+    "What is the weather in Paris today?",
+]
+
+
+# ====================================
+# Stub backends
+# ====================================
+
+class LatencyDist:
+    """Log-normal latency given a median and a p95 (seconds)"""
+
+    def __init__(self, median: float, p95: float):
+        self.median = median
+        # p95 of a log-normal sits 1.645 sigma above the median in log space
+        self.sigma = math.log(max(p95, median) / median) / 1.645 if median > 0 else 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        if self.median <= 0:
+            return 0.0
+        return self.median * math.exp(self.sigma * rng.gauss(0, 1))
+
+    def sleep(self, rng: random.Random):
+        time.sleep(self.sample(rng))
+
+
+class StubLLM:
+    """Chat model stand-in: judge prompts get YES/NO, others a canned answer"""
+
+    def __init__(self, latency: LatencyDist, web_fraction: float, seed: int = 0):
+        self.latency = latency
+        self.web_fraction = web_fraction
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _draw(self):
+        with self._lock:
+            return self.latency.sample(self._rng), self._rng.random()
+
+    def invoke(self, messages, **kwargs):
+        delay, u = self._draw()
+        time.sleep(delay)
+
+        prompt = messages[-1].content
+        if "routing controller" in prompt:
+            return AIMessage(content="NO" if u < self.web_fraction else "YES")
+        return AIMessage(content="stub answer")
+
+
+class StubRetriever:
+    """Retriever stand-in paying one embedding latency per query"""
+
+    def __init__(self, latency: LatencyDist, k: int = 4, seed: int = 1):
+        self.latency = latency
+        self.k = k
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def invoke(self, query: str) -> List[Document]:
+        with self._lock:
+            delay = self.latency.sample(self._rng)
+        time.sleep(delay)
+
+        digest = hashlib.sha1(query.encode()).hexdigest()
+        return [
+            Document(
+                page_content=f"stub chunk {i} for {digest[:8]}",
+                metadata={"source": f"stub://{digest[:8]}/{i}"},
+            )
+            for i in range(self.k)
+        ]
+
+
+class StubEmbeddings:
+    """Embedding stand-in: deterministic hash vectors, one latency per call"""
+
+    def __init__(self, latency: LatencyDist, dim: int = 64, seed: int = 3):
+        self.latency = latency
+        self.dim = dim
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _vector(self, text: str) -> List[float]:
+        rng = random.Random(hashlib.sha1(text.encode()).hexdigest())
+        return [rng.gauss(0, 1) for _ in range(self.dim)]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            delay = self.latency.sample(self._rng)
+        time.sleep(delay)
+        return [self._vector(t) for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+class StubSearch:
+    """TavilyClient stand-in"""
+
+    def __init__(self, latency: LatencyDist, seed: int = 2):
+        self.latency = latency
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def search(self, query: str, **kwargs) -> dict:
+        with self._lock:
+            delay = self.latency.sample(self._rng)
+        time.sleep(delay)
+        return {
+            "answer": "",
+            "results": [
+                {"content": f"stub web result {i} for {query}"}
+                for i in range(kwargs.get("max_results", 5))
+            ],
+        }
+
+
+# ====================================
+# Load generation
+# ====================================
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def load_questions(path: Optional[str]) -> List[str]:
+    """Question log: .jsonl with a 'question' field, or one question per line"""
+    if path is None:
+        return DEFAULT_QUESTIONS
+
+    questions = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("{"):
+            line = json.loads(line)["question"]
+        questions.append(line)
+    return questions
+
+
+def run_open_loop(
+    graph,
+    questions: List[str],
+    rate: float,
+    duration: float,
+    workers: int,
+    seed: int = 0,
+) -> Dict:
+    """
+    Fire requests at Poisson arrival times for `duration` seconds
+
+    Latency is measured from the scheduled arrival, so time spent queued
+    for a free worker counts against the request. Throughput is taken
+    over the span of completions (first to last), which tracks the
+    arrival rate while the system keeps up and the service rate once a
+    backlog builds. Queue growth compares the median latency of the
+    last third of arrivals with the first third.
+    """
+    rng = random.Random(seed)
+    arrivals = []
+    t = rng.expovariate(rate)
+    while t < duration:
+        arrivals.append(t)
+        t += rng.expovariate(rate)
+
+    latencies = {"docs": [], "web": [], "error": []}
+    # (arrival offset, latency, finish time) of successful requests
+    finished = []
+    degraded = [0]
+    first_error = [None]
+    lock = threading.Lock()
+
+    def one(question: str, scheduled: float, offset: float):
+        was_degraded = False
+        error = None
+        try:
+            result = graph.invoke({"question": question})
+            route = "web" if result.get("use_web") else "docs"
+            was_degraded = bool(result.get("debug_degraded"))
+        except Exception as e:
+            route = "error"
+            error = f"{type(e).__name__}: {e}"
+        now = time.perf_counter()
+        with lock:
+            latencies[route].append(now - scheduled)
+            degraded[0] += was_degraded
+            if route != "error":
+                finished.append((offset, now - scheduled, now))
+            if error is not None and first_error[0] is None:
+                first_error[0] = error
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for i, offset in enumerate(arrivals):
+            scheduled = start + offset
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(one, questions[i % len(questions)], scheduled, offset)
+
+    completed = len(latencies["docs"]) + len(latencies["web"])
+    all_ok = latencies["docs"] + latencies["web"]
+
+    finish_times = sorted(f for _, _, f in finished)
+    span = finish_times[-1] - finish_times[0] if len(finish_times) > 1 else 0.0
+
+    by_arrival = [lat for _, lat, _ in sorted(finished)]
+    third = len(by_arrival) // 3
+    if third >= 3:
+        early = percentile(by_arrival[:third], 50)
+        late = percentile(by_arrival[-third:], 50)
+        queue_growth = late / early if early > 0 else float("inf")
+    else:
+        queue_growth = float("nan")
+
+    report = {
+        "offered_rps": rate,
+        "arrival_rps": len(arrivals) / duration,
+        "sent": len(arrivals),
+        "completed": completed,
+        "errors": len(latencies["error"]),
+        "first_error": first_error[0],
+        "degraded": degraded[0],
+        "throughput_rps": (len(finish_times) - 1) / span if span else 0.0,
+        "queue_growth": queue_growth,
+    }
+    for route, values in (("all", all_ok), ("docs", latencies["docs"]), ("web", latencies["web"])):
+        report[route] = {
+            "count": len(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+        }
+    return report
+
+
+def find_saturation(
+    reports: List[Dict],
+    slo_p99: float,
+    max_queue_growth: float = 2.0,
+) -> Optional[float]:
+    """
+    First offered rate where a backlog builds, requests fail or p99 breaks the SLO
+
+    A backlog shows up as late arrivals waiting much longer than early
+    ones (queue_growth), which, unlike an in-window completion count,
+    doesn't depend on how latency compares with the run duration.
+    """
+    for r in reports:
+        behind = r["queue_growth"] > max_queue_growth
+        if behind or r["errors"] or r["all"]["p99"] > slo_p99:
+            return r["offered_rps"]
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--questions", help="question log (.txt or .jsonl)")
+    parser.add_argument("--rates", default="1,2,4,8,16", help="arrival rates (req/s) to sweep")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per rate")
+    parser.add_argument("--workers", type=int, default=32, help="graph executions in parallel")
+    parser.add_argument("--web-fraction", type=float, default=0.3, help="share of judge NO decisions")
+    parser.add_argument("--llm", default="0.8,2.5", help="LLM latency median,p95 (s)")
+    parser.add_argument("--embed", default="0.05,0.2", help="embedding latency median,p95 (s)")
+    parser.add_argument("--search", default="1.0,3.0", help="Tavily latency median,p95 (s)")
+    parser.add_argument("--slo-p99", type=float, default=10.0, help="p99 latency SLO (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    def dist(spec: str) -> LatencyDist:
+        median, p95 = (float(x) for x in spec.split(","))
+        return LatencyDist(median, p95)
+
+    graph = GraphBuilder(
+        retriever=StubRetriever(dist(args.embed), seed=args.seed + 1),
+        llm=StubLLM(dist(args.llm), args.web_fraction, seed=args.seed),
+        search_client=StubSearch(dist(args.search), seed=args.seed + 2),
+        web_index=EphemeralWebIndex(StubEmbeddings(dist(args.embed), seed=args.seed + 3)),
+    ).build()
+
+    questions = load_questions(args.questions)
+    reports = []
+
+    for rate in (float(r) for r in args.rates.split(",")):
+        print("\n=================================")
+        print(f"Offered load: {rate:g} req/s for {args.duration:g}s")
+
+        r = run_open_loop(graph, questions, rate, args.duration, args.workers, args.seed)
+        reports.append(r)
+
+        print(
+            f"Sent: {r['sent']}  Completed: {r['completed']}  "
+            f"Errors: {r['errors']}  Degraded: {r['degraded']}"
+        )
+        print(
+            f"Arrivals: {r['arrival_rps']:.2f} req/s  "
+            f"Throughput: {r['throughput_rps']:.2f} req/s  "
+            f"Queue growth: {r['queue_growth']:.2f}x"
+        )
+        if r["first_error"]:
+            print(f"First error: {r['first_error']}")
+        for route in ("all", "docs", "web"):
+            s = r[route]
+            print(
+                f"  {route:<5} n={s['count']:<5} "
+                f"p50={s['p50']:.3f}s p95={s['p95']:.3f}s p99={s['p99']:.3f}s"
+            )
+
+    print("\n=================================")
+    saturation = find_saturation(reports, args.slo_p99)
+    if saturation is None:
+        print("No saturation within the swept rates.")
+    else:
+        print(f"Saturation point: {saturation:g} req/s")
+    print("=================================")
+
+
+if __name__ == "__main__":
+    main()
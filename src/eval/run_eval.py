@@ -6,33 +6,45 @@ Computes:
 - nDCG
 - Key-Term Coverage
 - Routing Accuracy
+- Learned router agreement (vs LLM judge and gold routes)
 """
 
 from src.graph_builder.graph_builder import GraphBuilder
 from src.eval.metrics import mean_reciprocal_rank, ndcg, key_term_coverage
 from src.config.config import Config
 from src.doc_ingestion.doc_processor import DocumentProcessor
-from src.vectorstore.vectorstore import VectorStore
+from src.router.learned_router import route_features
+from src.serving.warmup import BackgroundIndexer
+from src.vectorstore.index_holder import HolderRetriever
+from src.clients.scheduler import priority_scope
 
 
 # ====================================
 # Build RAG System
 # ====================================
 
-print("Building RAG system...")
+def build_graph(router):
+    """Index the default corpus and compile the graph"""
 
-llm = Config.get_llm()
+    print("Building RAG system...")
 
-doc_processor = DocumentProcessor()
-vector_store = VectorStore()
+    llm = Config.get_llm("answer")
 
-documents = doc_processor.process_urls(Config.DEFAULT_URLS)
-vector_store.create_vectorstore(documents)
+    # same background indexer as the app; eval needs the full corpus
+    indexer = BackgroundIndexer(
+        DocumentProcessor(),
+        Config.DEFAULT_URLS,
+        batch_size=Config.WARMUP_BATCH_SIZE
+    ).start()
+    indexer.wait_done()
 
-graph = GraphBuilder(
-    retriever=vector_store.get_retriever(),
-    llm=llm
-).build()
+    # no route_logger: eval questions must not leak into the router's training log
+    return GraphBuilder(
+        retriever=HolderRetriever(indexer.holder),
+        llm=llm,
+        judge_llm=Config.get_llm("judge"),
+        router=router
+    ).build()
 
 
 # ====================================
@@ -68,96 +80,143 @@ eval_data = [
 ]
 
 
-# ====================================
-# Metric Containers
-# ====================================
+def evaluate(graph, router):
+    """Run every eval sample through the graph and print the metrics"""
 
-mrr_scores = []
-ndcg_scores = []
-coverage_scores = []
+    # ====================================
+    # Metric Containers
+    # ====================================
 
-correct_routes = 0
-total_questions = len(eval_data)
+    mrr_scores = []
+    ndcg_scores = []
+    coverage_scores = []
 
+    correct_routes = 0
+    total_questions = len(eval_data)
 
-# ====================================
-# Evaluation Loop
-# ====================================
+    router_vs_gold = []
+    router_vs_judge = []
+    local_routed = 0
 
-for sample in eval_data:
 
-    print("\n=================================")
-    print("Question:", sample["question"])
+    # ====================================
+    # Evaluation Loop
+    # ====================================
 
-    result = graph.invoke({"question": sample["question"]})
+    for sample in eval_data:
 
-    retrieved_docs = result.get("retrieved_docs", [])
-    answer = result.get("answer", "")
-    used_web = result.get("use_web", False)
+        print("\n=================================")
+        print("Question:", sample["question"])
 
-    predicted_route = "web" if used_web else "docs"
+        # eval traffic yields to interactive requests
+        with priority_scope("eval"):
+            result = graph.invoke({"question": sample["question"]})
 
-    print("Predicted Route:", predicted_route)
-    print("Gold Route:", sample["gold_route"])
+        retrieved_docs = result.get("retrieved_docs", [])
+        answer = result.get("answer", "")
+        used_web = result.get("use_web", False)
 
-    # ------------------------------
-    # Routing Accuracy
-    # ------------------------------
+        predicted_route = "web" if used_web else "docs"
 
-    if predicted_route == sample["gold_route"]:
-        correct_routes += 1
+        print("Predicted Route:", predicted_route)
+        print("Gold Route:", sample["gold_route"])
 
-    # ------------------------------
-    # Retrieval Metrics (DOC ONLY)
-    # ------------------------------
+        # ------------------------------
+        # Routing Accuracy
+        # ------------------------------
 
-    if sample["gold_route"] == "docs":
+        if predicted_route == sample["gold_route"]:
+            correct_routes += 1
 
-        print("Retrieved Sources:")
+        # ------------------------------
+        # Learned Router Agreement
+        # ------------------------------
 
-        for d in retrieved_docs:
-            print(d.metadata.get("source"))
+        if result.get("debug_router_source") == "local":
+            local_routed += 1
 
-        print("Gold Source:", sample["gold_source"])
-        print("------")
+        if router is not None and result.get("question_embedding"):
+            features = route_features(
+                result["question_embedding"],
+                result.get("retrieval_scores", [])
+            )
+            router_route = "web" if router.predict_proba(features) >= 0.5 else "docs"
 
-        mrr = mean_reciprocal_rank(
-            retrieved_docs,
-            sample["relevant_sources"]
-        )
+            router_vs_gold.append(router_route == sample["gold_route"])
 
-        ndcg_score = ndcg(
-            retrieved_docs,
-            sample["relevant_sources"]
-        )
+            if result.get("debug_router_source") == "llm":
+                router_vs_judge.append(router_route == predicted_route)
 
-        context = "\n".join(
-            d.page_content for d in retrieved_docs
-        )
+        # ------------------------------
+        # Retrieval Metrics (DOC ONLY)
+        # ------------------------------
 
-        coverage = key_term_coverage(
-            answer,
-            context
-        )
+        if sample["gold_route"] == "docs":
 
-        mrr_scores.append(mrr)
-        ndcg_scores.append(ndcg_score)
-        coverage_scores.append(coverage)
+            print("Retrieved Sources:")
 
+            for d in retrieved_docs:
+                print(d.metadata.get("source"))
 
-# ====================================
-# Final Metrics
-# ====================================
+            print("Gold Source:", sample["gold_source"])
+            print("------")
+
+            mrr = mean_reciprocal_rank(
+                retrieved_docs,
+                sample["relevant_sources"]
+            )
+
+            ndcg_score = ndcg(
+                retrieved_docs,
+                sample["relevant_sources"]
+            )
+
+            context = "\n".join(
+                d.page_content for d in retrieved_docs
+            )
+
+            coverage = key_term_coverage(
+                answer,
+                context
+            )
+
+            mrr_scores.append(mrr)
+            ndcg_scores.append(ndcg_score)
+            coverage_scores.append(coverage)
+
+
+    # ====================================
+    # Final Metrics
+    # ====================================
+
+    print("\n=================================")
+
+    if mrr_scores:
+        print("Mean MRR:", sum(mrr_scores) / len(mrr_scores))
+        print("Mean nDCG:", sum(ndcg_scores) / len(ndcg_scores))
+        print("Mean Key-Term Coverage:", sum(coverage_scores) / len(coverage_scores))
+    else:
+        print("No document-based samples for retrieval metrics.")
+
+    print("Routing Accuracy:", correct_routes / total_questions)
+
+    if router is not None:
+        print("Routed locally:", local_routed, "/", total_questions)
+        if router_vs_gold:
+            print("Router vs Gold Route:", sum(router_vs_gold) / len(router_vs_gold))
+        if router_vs_judge:
+            print("Router vs LLM Judge:", sum(router_vs_judge) / len(router_vs_judge))
+    else:
+        print("No learned router trained yet (python -m src.router.learned_router).")
+
+    print("=================================")
 
-print("\n=================================")
 
-if mrr_scores:
-    print("Mean MRR:", sum(mrr_scores) / len(mrr_scores))
-    print("Mean nDCG:", sum(ndcg_scores) / len(ndcg_scores))
-    print("Mean Key-Term Coverage:", sum(coverage_scores) / len(coverage_scores))
-else:
-    print("No document-based samples for retrieval metrics.")
+def main():
+    router = Config.get_router()
+    graph = build_graph(router)
+    evaluate(graph, router)
 
-print("Routing Accuracy:", correct_routes / total_questions)
 
-print("=================================")
+if __name__ == "__main__":
+    main()
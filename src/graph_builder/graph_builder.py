@@ -7,8 +7,27 @@ from src.nodes.nodes import RAGNodes
 class GraphBuilder:
     """Builds router-based Agentic RAG graph"""
 
-    def __init__(self, retriever, llm):
-        self.nodes = RAGNodes(retriever, llm)
+    def __init__(
+        self,
+        retriever,
+        llm,
+        router=None,
+        route_logger=None,
+        judge_llm=None,
+        search_client=None,
+        web_index=None,
+        hedger=None,
+    ):
+        self.nodes = RAGNodes(
+            retriever,
+            llm,
+            router=router,
+            route_logger=route_logger,
+            judge_llm=judge_llm,
+            search_client=search_client,
+            web_index=web_index,
+            hedger=hedger,
+        )
 
     def build(self):
         graph = StateGraph(RAGState)
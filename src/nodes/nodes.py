@@ -1,6 +1,7 @@
 """LangGraph nodes for router-based Agentic RAG"""
 
 import os
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -8,28 +9,135 @@ load_dotenv()
 # required by Wikipedia / Tavily
 os.environ["USER_AGENT"] = "agentic-rag-project/1.0"
 
-from tavily import TavilyClient
 from langchain_core.messages import HumanMessage
 
+from src.clients.scheduler import estimate_tokens
+from src.config.config import Config
 from src.state.rag_state import RAGState
-
-
-# Tavily client
-tavily = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+from src.router.learned_router import LearnedRouter, RouteLogger
+from src.serving.hedging import DeadlineExceeded, Hedger, attempt_timeout, remaining
+from src.vectorstore.ephemeral_index import EphemeralWebIndex
 
 
 class RAGNodes:
     """All node logic lives here"""
 
-    def __init__(self, retriever, llm):
+    def __init__(
+        self,
+        retriever,
+        llm,
+        router: LearnedRouter = None,
+        route_logger: RouteLogger = None,
+        judge_llm=None,
+        search_client=None,
+        web_index: EphemeralWebIndex = None,
+        hedger: Hedger = None,
+    ):
         self.retriever = retriever
         self.llm = llm
+        self.judge_llm = judge_llm or llm
+        self.router = router
+        self.route_logger = route_logger
+        self._search_client = search_client
+        self._web_index = web_index
+        self.hedger = hedger or Config.get_hedger()
+
+    @property
+    def search_client(self):
+        """Tavily client (pooled session shared via the client registry)"""
+        if self._search_client is None:
+            self._search_client = Config.get_clients().tavily(Config.TAVILY_API_KEY)
+        return self._search_client
+
+    @property
+    def web_index(self):
+        """Ephemeral index used to rank web chunks (TTL-shared embeddings)"""
+        if self._web_index is None:
+            self._web_index = EphemeralWebIndex(
+                Config.get_clients().embeddings(),
+                chunk_size=Config.CHUNK_SIZE,
+                chunk_overlap=Config.CHUNK_OVERLAP,
+                ttl=Config.WEB_INDEX_TTL,
+            )
+        return self._web_index
+
+    def _ask(
+        self,
+        llm,
+        prompt: str,
+        state: RAGState,
+        call_type: str,
+        reserve: float = 0.0,
+    ) -> str:
+        """Hedged LLM call bounded by the remaining request budget"""
+        timeout = min(
+            remaining(state.deadline) - reserve,
+            Config.TIMEOUTS[call_type],
+        )
+        # judge and answer latencies differ a lot, so hedge on separate p95s
+        response = self.hedger.call(
+            call_type,
+            lambda: llm.invoke(
+                [HumanMessage(content=prompt)],
+                timeout=attempt_timeout(timeout),
+            ),
+            timeout=timeout,
+        )
+        return response.content
+
+    def _fallback_answer(self, state: RAGState) -> str:
+        """Best effort when the budget runs out before an LLM answer"""
+        if not state.retrieved_docs:
+            return "Sorry, this request ran out of time. Please try again."
+        return (
+            "Sorry, generating a full answer took too long. "
+            "Most relevant passage found:\n\n"
+            + state.retrieved_docs[0].page_content
+        )
 
     # --------------------------------------------------
     # 1. Retrieve from vector DB
     # --------------------------------------------------
+    def _search(self, question: str):
+        """Retrieve (embedding, [(doc, score)]) or (None, docs) without scores"""
+        # embed once, keep the embedding + scores as routing features
+        if hasattr(self.retriever, "search_with_scores"):
+            return self.retriever.search_with_scores(question)
+
+        vectorstore = getattr(self.retriever, "vectorstore", None)
+        if vectorstore is not None:
+            k = self.retriever.search_kwargs.get("k", 4)
+            embedding = vectorstore.embeddings.embed_query(question)
+            return embedding, vectorstore.similarity_search_with_score_by_vector(
+                embedding, k=k
+            )
+        return None, self.retriever.invoke(question)
+
     def retrieve_docs(self, state: RAGState) -> RAGState:
-        docs = self.retriever.invoke(state.question)
+        if state.deadline is None:
+            state.deadline = time.time() + Config.REQUEST_BUDGET
+
+        # the query embedding shares the budget; keep enough to answer
+        timeout = min(
+            remaining(state.deadline) - Config.ANSWER_RESERVE,
+            Config.TIMEOUTS["embed"],
+        )
+        try:
+            embedding, found = self.hedger.call(
+                "embed", lambda: self._search(state.question), timeout=timeout
+            )
+        except DeadlineExceeded:
+            # judge_docs sends an empty retrieval to the web route
+            state.debug_degraded = state.debug_degraded + ["retrieval timed out"]
+            embedding, found = None, []
+
+        if embedding is None:
+            docs = found
+        else:
+            docs = [d for d, _ in found]
+            state.question_embedding = list(embedding)
+            state.retrieval_scores = [float(s) for _, s in found]
+
         state.retrieved_docs = docs
         state.debug_retrieved_count = len(docs)
         return state
@@ -44,6 +152,24 @@ class RAGNodes:
             state.use_web = True
             return state
 
+        # local router first, LLM judge only when it is not confident
+        if self.router is not None and state.question_embedding:
+            routed_web = self.router.decide(
+                state.question_embedding, state.retrieval_scores
+            )
+            if routed_web is not None:
+                state.debug_judge_decision = "NO" if routed_web else "YES"
+                state.debug_router_source = "local"
+                state.use_web = routed_web
+                return state
+
+        # not enough budget to judge and still answer: answer from docs
+        if remaining(state.deadline) <= Config.ANSWER_RESERVE:
+            state.debug_judge_decision = "SKIPPED_DEADLINE"
+            state.debug_degraded = state.debug_degraded + ["judge skipped"]
+            state.use_web = False
+            return state
+
         context = "\n".join(
             d.page_content[:500] for d in state.retrieved_docs
         )
@@ -69,37 +195,100 @@ Answer ONLY YES or NO.
 """
 
 
-        decision = (
-            self.llm
-            .invoke([HumanMessage(content=prompt)])
-            .content.strip().upper()
-        )
+        try:
+            decision = self._ask(
+                self.judge_llm,
+                prompt,
+                state,
+                "judge",
+                reserve=Config.ANSWER_RESERVE,
+            ).strip().upper()
+        except DeadlineExceeded:
+            state.debug_judge_decision = "TIMEOUT"
+            state.debug_degraded = state.debug_degraded + ["judge timed out"]
+            state.use_web = False
+            return state
 
         state.debug_judge_decision = decision
+        state.debug_router_source = "llm"
         state.use_web = not decision.startswith("YES")
+
+        if self.route_logger is not None and state.question_embedding:
+            self.route_logger.log(
+                state.question,
+                state.question_embedding,
+                state.retrieval_scores,
+                state.use_web,
+            )
         return state
 
     # --------------------------------------------------
     # 3A. Web fallback (Tavily)
     # --------------------------------------------------
     def web_search(self, state: RAGState) -> RAGState:
-        result = tavily.search(
-            query=state.question,
-            search_depth="advanced",
-            max_results=5,
+        search_timeout = min(
+            remaining(state.deadline) - Config.ANSWER_RESERVE,
+            Config.TIMEOUTS["search"],
         )
+        try:
+            result = self.hedger.call(
+                "search",
+                lambda: self.search_client.search(
+                    query=state.question,
+                    search_depth="advanced",
+                    max_results=5,
+                    timeout=attempt_timeout(search_timeout),
+                ),
+                timeout=search_timeout,
+            )
+        except DeadlineExceeded:
+            # answer from whatever the docs have instead
+            state.debug_degraded = state.debug_degraded + ["web search timed out"]
+            state.use_web = False
+            return self.generate_answer(state)
 
         # raw payload (for debugging)
         state.debug_web_raw = str(result)
 
         # ⚠️ IMPORTANT: Tavily does NOT always return `answer`
+        parts = []
+        budget = Config.WEB_CONTEXT_TOKEN_BUDGET
         if "answer" in result and result["answer"]:
-            web_context = result["answer"]
-        else:
-            web_context = "\n\n".join(
-                r.get("content", "")
-                for r in result.get("results", [])
+            parts.append(result["answer"])
+            budget -= estimate_tokens(result["answer"])
+
+        # only the most relevant page chunks, within the token budget
+        rank_timeout = min(
+            remaining(state.deadline) - Config.ANSWER_RESERVE,
+            Config.TIMEOUTS["embed"],
+        )
+        try:
+            ranked = self.hedger.call(
+                "embed",
+                lambda: self.web_index.top_chunks(
+                    state.question,
+                    result.get("results", []),
+                    token_budget=max(budget, 0),
+                    query_embedding=state.question_embedding or None,
+                ),
+                timeout=rank_timeout,
+            )
+            parts.extend(
+                f"[{chunk.metadata['source']}]\n{chunk.page_content}"
+                for chunk, _ in ranked
             )
+        except Exception as e:
+            # ranking is an optimisation: fall back to the raw page contents
+            state.debug_degraded = state.debug_degraded + [
+                f"web ranking skipped ({type(e).__name__})"
+            ]
+            raw = "\n\n".join(
+                r.get("content") or "" for r in result.get("results", [])
+            )
+            # estimate_tokens counts ~4 characters per token
+            parts.append(raw[:max(budget, 0) * 4])
+
+        web_context = "\n\n".join(parts)
 
         state.debug_web_context = web_context
 
@@ -116,11 +305,11 @@ Question:
 {state.question}
 """
 
-        response = self.llm.invoke(
-            [HumanMessage(content=prompt)]
-        )
-
-        state.answer = response.content
+        try:
+            state.answer = self._ask(self.llm, prompt, state, "answer")
+        except DeadlineExceeded:
+            state.debug_degraded = state.debug_degraded + ["answer timed out"]
+            state.answer = self._fallback_answer(state)
         return state
 
     # --------------------------------------------------
@@ -146,9 +335,9 @@ Question:
 {state.question}
 """
 
-        response = self.llm.invoke(
-            [HumanMessage(content=prompt)]
-        )
-
-        state.answer = response.content
+        try:
+            state.answer = self._ask(self.llm, prompt, state, "answer")
+        except DeadlineExceeded:
+            state.debug_degraded = state.debug_degraded + ["answer timed out"]
+            state.answer = self._fallback_answer(state)
         return state
@@ -0,0 +1,242 @@
+"""Lightweight local router distilled from judge_docs decisions"""
+
+import json
+from pathlib import Path
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+def route_features(
+    question_embedding: Sequence[float],
+    retrieval_scores: Sequence[float],
+) -> np.ndarray:
+    """
+    Build the feature vector for one routing decision
+
+    Args:
+        question_embedding: Embedding of the user question
+        retrieval_scores: FAISS distances of the retrieved docs (lower is closer)
+
+    Returns:
+        1-D feature vector (embedding + retrieval score summary)
+    """
+    emb = np.asarray(question_embedding, dtype=np.float32)
+    scores = np.asarray(retrieval_scores, dtype=np.float32)
+
+    if scores.size:
+        summary = [scores.min(), scores.mean(), scores.max(), scores.size]
+    else:
+        summary = [0.0, 0.0, 0.0, 0.0]
+
+    return np.concatenate([emb, np.asarray(summary, dtype=np.float32)])
+
+
+class RouteLogger:
+    """Appends (question embedding, retrieval scores, judge decision) tuples to a JSONL log"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+
+    def log(
+        self,
+        question: str,
+        question_embedding: Sequence[float],
+        retrieval_scores: Sequence[float],
+        use_web: bool,
+    ):
+        """Append one judge decision to the log"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        record = {
+            "question": question,
+            "embedding": [float(x) for x in question_embedding],
+            "scores": [float(s) for s in retrieval_scores],
+            "use_web": bool(use_web),
+        }
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def load(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Load the log as a (features, labels) pair, label 1 == web"""
+        X, y = [], []
+        if not self.path.exists():
+            return np.empty((0, 0), dtype=np.float32), np.empty(0, dtype=np.float32)
+
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                X.append(route_features(record["embedding"], record["scores"]))
+                y.append(1.0 if record["use_web"] else 0.0)
+
+        if not X:
+            return np.empty((0, 0), dtype=np.float32), np.empty(0, dtype=np.float32)
+        return np.stack(X), np.asarray(y, dtype=np.float32)
+
+
+class LearnedRouter:
+    """Logistic regression router trained on logged LLM judge decisions"""
+
+    def __init__(self, confidence: float = 0.9):
+        """
+        Args:
+            confidence: Minimum probability of the predicted class before
+                the local decision is trusted over the LLM judge
+        """
+        self.confidence = confidence
+        self.weights: Optional[np.ndarray] = None
+        self.bias = 0.0
+        self.mean: Optional[np.ndarray] = None
+        self.std: Optional[np.ndarray] = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self.weights is not None
+
+    def fit(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        epochs: int = 300,
+        lr: float = 0.1,
+        l2: float = 1e-3,
+    ) -> "LearnedRouter":
+        """
+        Train with full-batch gradient descent
+
+        Args:
+            X: Feature matrix, one row per logged decision
+            y: Labels (1 == web, 0 == docs)
+        """
+        if len(X) == 0:
+            raise ValueError("No logged decisions to train on.")
+
+        self.mean = X.mean(axis=0)
+        self.std = X.std(axis=0) + 1e-6
+        Xn = (X - self.mean) / self.std
+
+        w = np.zeros(Xn.shape[1], dtype=np.float32)
+        b = 0.0
+        n = len(Xn)
+
+        for _ in range(epochs):
+            p = self._sigmoid(Xn @ w + b)
+            err = p - y
+            w -= lr * (Xn.T @ err / n + l2 * w)
+            b -= lr * float(err.mean())
+
+        self.weights = w
+        self.bias = b
+        return self
+
+    def predict_proba(self, features: np.ndarray) -> float:
+        """Probability that the question should be routed to web"""
+        if not self.is_trained:
+            raise ValueError("Router not trained. Call fit or load first.")
+        x = (features - self.mean) / self.std
+        return float(self._sigmoid(x @ self.weights + self.bias))
+
+    def decide(
+        self,
+        question_embedding: Sequence[float],
+        retrieval_scores: Sequence[float],
+    ) -> Optional[bool]:
+        """
+        Route locally if confident
+
+        Returns:
+            True for web, False for docs, None when the LLM judge should decide
+        """
+        if not self.is_trained:
+            return None
+
+        features = route_features(question_embedding, retrieval_scores)
+        if features.shape[0] != self.weights.shape[0]:
+            return None
+
+        p_web = self.predict_proba(features)
+        if max(p_web, 1.0 - p_web) < self.confidence:
+            return None
+        return p_web >= 0.5
+
+    def agreement(self, X: np.ndarray, labels: Sequence[bool]) -> float:
+        """Fraction of rows where the router agrees with the given labels (True == web)"""
+        if len(X) == 0:
+            return 0.0
+        preds = [self.predict_proba(x) >= 0.5 for x in X]
+        return sum(p == bool(l) for p, l in zip(preds, labels)) / len(preds)
+
+    def save(self, path: Union[str, Path]):
+        """Persist weights and normalisation stats to an .npz file"""
+        if not self.is_trained:
+            raise ValueError("Router not trained. Call fit first.")
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            path,
+            weights=self.weights,
+            bias=np.asarray(self.bias),
+            mean=self.mean,
+            std=self.std,
+            confidence=np.asarray(self.confidence),
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "LearnedRouter":
+        """Load a router saved with save()"""
+        data = np.load(path)
+        router = cls(confidence=float(data["confidence"]))
+        router.weights = data["weights"]
+        router.bias = float(data["bias"])
+        router.mean = data["mean"]
+        router.std = data["std"]
+        return router
+
+    @staticmethod
+    def _sigmoid(z):
+        return 1.0 / (1.0 + np.exp(-np.clip(z, -30, 30)))
+
+
+def train_from_log(
+    log_path: Union[str, Path],
+    model_path: Union[str, Path],
+    confidence: float = 0.9,
+    holdout: float = 0.2,
+    seed: int = 0,
+) -> LearnedRouter:
+    """
+    Train a router from a RouteLogger log and save it
+
+    Agreement with the LLM judge is measured on a held-out share of the
+    log; the saved router is then refit on every decision.
+    """
+    X, y = RouteLogger(log_path).load()
+
+    order = np.random.default_rng(seed).permutation(len(X))
+    n_test = int(len(X) * holdout)
+    test, train = order[:n_test], order[n_test:]
+
+    if n_test:
+        held_out = LearnedRouter(confidence=confidence).fit(X[train], y[train])
+        print(
+            "Held-out agreement with LLM judge:",
+            held_out.agreement(X[test], [bool(v) for v in y[test]]),
+            f"({n_test} decisions)",
+        )
+    else:
+        print("Too few decisions for a held-out split; agreement not measured")
+
+    router = LearnedRouter(confidence=confidence).fit(X, y)
+    router.save(model_path)
+    print("Trained on:", len(X), "decisions")
+    return router
+
+
+if __name__ == "__main__":
+    from src.config.config import Config
+
+    train_from_log(
+        Config.ROUTER_LOG_PATH,
+        Config.ROUTER_MODEL_PATH,
+        Config.ROUTER_CONFIDENCE,
+    )
@@ -0,0 +1,209 @@
+"""Per-request deadlines and hedged calls for slow LLM / search providers"""
+
+import contextvars
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+
+# time.monotonic() by which the current hedged attempt must give up
+_attempt_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "attempt_deadline", default=None
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request's latency budget ran out before a call returned"""
+
+
+def remaining(deadline: Optional[float]) -> float:
+    """Seconds left before an absolute time.time() deadline (inf if none)"""
+    if deadline is None:
+        return math.inf
+    return deadline - time.time()
+
+
+def attempt_timeout(default: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds left for the hedged attempt running in this context
+
+    Outbound calls pass this as their own timeout so an attempt the
+    hedger has given up on stops too, instead of running on under the
+    client's fixed timeout. Outside an attempt returns `default`.
+    """
+    end = _attempt_deadline.get()
+    if end is None:
+        return default
+    left = max(end - time.monotonic(), 0.0)
+    return left if default is None else min(left, default)
+
+
+class Hedger:
+    """
+    Runs calls with a timeout and fires one duplicate for stragglers
+
+    If the first attempt hasn't returned after the observed p95 latency
+    for its kind, a second identical attempt is started and whichever
+    finishes first wins. Attempts run with their deadline in context
+    (see attempt_timeout), so a loser stops at the deadline at the
+    latest. Hedges are only sent while at most half the pool is busy,
+    so under load the remaining threads go to other requests' first
+    attempts instead of duplicates. `congested` reports provider-side
+    queueing (e.g. rate-limit scheduler waiters); while it is true a
+    slow attempt is most likely waiting for quota, and a duplicate would
+    only take a second queue slot, so no hedge is sent.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 32,
+        quantile: float = 95.0,
+        default_delay: float = 3.0,
+        min_samples: int = 20,
+        window: int = 500,
+        congested: Optional[Callable[[], bool]] = None,
+    ):
+        self.quantile = quantile
+        self.default_delay = default_delay
+        self.min_samples = min_samples
+        self.window = window
+
+        self.max_workers = max_workers
+        self.congested = congested
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+        self._running = 0
+
+        # counters
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.hedges_skipped = 0
+        self.deadline_exceeded = 0
+
+    def hedge_delay(self, kind: str) -> float:
+        """p95 of recent latencies for this kind (default until warmed up)"""
+        with self._lock:
+            samples = sorted(self._samples.get(kind, ()))
+        if len(samples) < self.min_samples:
+            return self.default_delay
+        rank = max(1, math.ceil(self.quantile / 100 * len(samples)))
+        return samples[rank - 1]
+
+    def _record(self, kind: str, elapsed: float):
+        with self._lock:
+            self._samples.setdefault(kind, deque(maxlen=self.window)).append(elapsed)
+
+    def _submit(self, fn: Callable[[], Any], end: float) -> Tuple[Any, float]:
+        """Start an attempt; returns (future, start time)"""
+        # keep contextvars (e.g. scheduler priority) inside pool threads
+        ctx = contextvars.copy_context()
+        ctx.run(_attempt_deadline.set, end)
+
+        def timed():
+            start = time.monotonic()
+            try:
+                result = ctx.run(fn)
+            finally:
+                with self._lock:
+                    self._running -= 1
+            return result, time.monotonic() - start
+
+        with self._lock:
+            self._running += 1
+        return self._pool.submit(timed), time.monotonic()
+
+    def _record_pending(
+        self,
+        kind: str,
+        attempts: List[Tuple[Any, float]],
+        pending,
+        before: float = math.inf,
+    ):
+        """Record unfinished attempts (started before `before`) at their time so far"""
+        now = time.monotonic()
+        for future, started in attempts:
+            if future in pending and started < before:
+                self._record(kind, now - started)
+
+    def call(self, kind: str, fn: Callable[[], Any], timeout: float) -> Any:
+        """
+        Call fn() within `timeout` seconds, hedging after the p95 delay
+
+        Raises:
+            DeadlineExceeded: no attempt returned in time
+        """
+        with self._lock:
+            self.calls += 1
+
+        if timeout <= 0:
+            with self._lock:
+                self.deadline_exceeded += 1
+            raise DeadlineExceeded(f"No budget left for {kind} call")
+
+        end = time.monotonic() + timeout
+        primary, started = self._submit(fn, end)
+        attempts = [(primary, started)]
+        pending = {primary}
+
+        done, _ = wait(pending, timeout=min(self.hedge_delay(kind), timeout))
+        if not done and end - time.monotonic() > 0:
+            congested = self.congested is not None and self.congested()
+            with self._lock:
+                idle = self._running <= self.max_workers // 2 and not congested
+                if idle:
+                    self.hedged += 1
+                else:
+                    self.hedges_skipped += 1
+            if idle:
+                attempts.append(self._submit(fn, end))
+                pending.add(attempts[-1][0])
+
+        error = None
+        while pending:
+            left = end - time.monotonic()
+            if left <= 0:
+                break
+            done, pending = wait(pending, timeout=left, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                result, elapsed = future.result()
+                self._record(kind, elapsed)
+                # a loser started earlier is known to be slower than the winner
+                winner_started = dict(attempts)[future]
+                self._record_pending(kind, attempts, pending, before=winner_started)
+                if future is not primary:
+                    with self._lock:
+                        self.hedge_wins += 1
+                return result
+
+        if error is not None and not pending:
+            if isinstance(error, DeadlineExceeded):
+                with self._lock:
+                    self.deadline_exceeded += 1
+            raise error
+
+        # timed-out attempts are the slow tail the p95 has to see
+        self._record_pending(kind, attempts, pending)
+        with self._lock:
+            self.deadline_exceeded += 1
+        raise DeadlineExceeded(f"{kind} call exceeded its {timeout:.1f}s budget")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            kinds = list(self._samples)
+            stats = {
+                "calls": self.calls,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "hedges_skipped": self.hedges_skipped,
+                "deadline_exceeded": self.deadline_exceeded,
+            }
+        stats["hedge_delay"] = {k: round(self.hedge_delay(k), 3) for k in kinds}
+        return stats
@@ -0,0 +1,139 @@
+"""Single-flight coalescing of identical concurrent graph executions"""
+
+import asyncio
+import re
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Union
+
+
+def normalize_question(question: str) -> str:
+    """Case-fold and collapse whitespace so trivially different texts coalesce"""
+    return re.sub(r"\s+", " ", question).strip().casefold()
+
+
+class _Call:
+    """One in-flight execution that duplicates wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """
+    Runs a function at most once per key at a time
+
+    Concurrent callers with the same key block on the in-flight call and
+    receive its result (or exception). Nothing is cached after the call
+    finishes, so results are never stale.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Hashable, asyncio.Future] = {}
+
+        # counters
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Call fn(), or wait for the identical in-flight call"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Async variant: await fn(), or the identical in-flight task"""
+        # futures are bound to their event loop
+        key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            fut = self._async_calls.get(key)
+            if fut is not None:
+                self.coalesced += 1
+            else:
+                fut = asyncio.ensure_future(fn())
+                self._async_calls[key] = fut
+                self.executions += 1
+                fut.add_done_callback(lambda _f: self._forget(key, _f))
+
+        # shield so one cancelled waiter doesn't cancel everyone else's call
+        return await asyncio.shield(fut)
+
+    def _forget(self, key: Hashable, fut: asyncio.Future):
+        with self._lock:
+            if self._async_calls.get(key) is fut:
+                del self._async_calls[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Executions run vs duplicate executions saved"""
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "saved": self.coalesced,
+                "in_flight": len(self._calls) + len(self._async_calls),
+            }
+
+
+class CoalescedGraph:
+    """
+    Wraps a compiled graph so identical concurrent questions share one run
+
+    The key is the normalized question plus the index version, so a
+    rebuilt index never serves an answer computed against the old one.
+    """
+
+    def __init__(
+        self,
+        graph,
+        index_version: Union[Hashable, Callable[[], Hashable]] = 0,
+    ):
+        self.graph = graph
+        self.index_version = index_version
+        self.flight = SingleFlight()
+
+    def _key(self, inputs: dict) -> Hashable:
+        version = self.index_version() if callable(self.index_version) else self.index_version
+        return normalize_question(inputs["question"]), version
+
+    def invoke(self, inputs: dict, **kwargs) -> dict:
+        result = self.flight.do(
+            self._key(inputs),
+            lambda: self.graph.invoke(inputs, **kwargs),
+        )
+        # each caller gets its own top-level dict
+        return dict(result)
+
+    async def ainvoke(self, inputs: dict, **kwargs) -> dict:
+        result = await self.flight.do_async(
+            self._key(inputs),
+            lambda: self.graph.ainvoke(inputs, **kwargs),
+        )
+        return dict(result)
+
+    def stats(self) -> Dict[str, int]:
+        return self.flight.stats()
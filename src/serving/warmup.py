@@ -0,0 +1,131 @@
+"""Progressive background indexing: serve queries while the corpus is still loading"""
+
+import threading
+from typing import Callable, Dict, List, Optional
+
+from src.clients.scheduler import priority_scope
+from src.doc_ingestion.doc_processor import DocumentProcessor
+from src.vectorstore.index_holder import IndexHolder
+from src.vectorstore.vectorstore import VectorStore
+
+
+class BackgroundIndexer:
+    """
+    Ingests sources in batches on a worker thread
+
+    Immutable VectorStore snapshots are swapped into the IndexHolder as
+    the corpus grows; readers always search the latest snapshot while
+    the worker keeps adding to its private copy. A snapshot is a full
+    copy, so one is only taken once the index has doubled since the
+    last one (total copying stays linear in corpus size); the finished
+    index is published as-is, without a copy. With progressive=False
+    only the finished index is swapped in (used for rebuilding a live
+    index).
+    """
+
+    def __init__(
+        self,
+        doc_processor: DocumentProcessor,
+        sources: List[str],
+        batch_size: int = 1,
+        holder: Optional[IndexHolder] = None,
+        progressive: bool = True,
+        on_snapshot: Optional[Callable[[VectorStore], None]] = None,
+    ):
+        self.doc_processor = doc_processor
+        self.sources = list(sources)
+        self.batch_size = batch_size
+        self.holder = holder or IndexHolder()
+        self.progressive = progressive
+        self.on_snapshot = on_snapshot
+
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.sources_done = 0
+        self.chunks = 0
+        self.error: Optional[BaseException] = None
+
+    def start(self) -> "BackgroundIndexer":
+        """Start the worker (no-op if already running)"""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="background-indexer", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def _run(self):
+        with priority_scope("ingest"):
+            self._index_all()
+
+    def _index_all(self):
+        building = VectorStore()
+        published = 0
+        try:
+            for i in range(0, len(self.sources), self.batch_size):
+                batch = self.sources[i:i + self.batch_size]
+                documents, spans = self.doc_processor.process_urls_to_spans(batch)
+
+                if spans:
+                    building.create_vectorstore_from_spans(documents, spans)
+
+                with self._lock:
+                    self.sources_done += len(batch)
+                    self.chunks += len(spans)
+                    chunks = self.chunks
+
+                last = i + self.batch_size >= len(self.sources)
+                if spans and self.progressive and not last and chunks >= 2 * published:
+                    self._publish(building.snapshot())
+                    published = chunks
+
+            if building.vectostore is not None and self.chunks > published:
+                # nobody else holds `building` any more, no copy needed
+                self._publish(building)
+        except BaseException as e:
+            self.error = e
+        finally:
+            self._done.set()
+            # unblock waiters even if nothing could be indexed
+            self._ready.set()
+
+    def _publish(self, snapshot: VectorStore):
+        self.holder.swap(snapshot)
+        self._ready.set()
+        if self.on_snapshot is not None:
+            self.on_snapshot(snapshot)
+
+    @property
+    def ready(self) -> bool:
+        """True once an index is being served from the holder"""
+        return self.holder.ready
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until the first snapshot is published (or indexing ends)"""
+        self._ready.wait(timeout)
+        return self.ready
+
+    def wait_done(self, timeout: Optional[float] = None) -> bool:
+        """Block until every source has been indexed"""
+        self._done.wait(timeout)
+        if self.error is not None:
+            raise self.error
+        return self.done
+
+    def progress(self) -> Dict:
+        with self._lock:
+            return {
+                "sources_done": self.sources_done,
+                "sources_total": len(self.sources),
+                "chunks": self.chunks,
+                "ready": self.holder.ready,
+                "done": self._done.is_set(),
+                "error": repr(self.error) if self.error else None,
+            }
@@ -0,0 +1,150 @@
+"""
+Multi-process serving over one read-only, memory-mapped FAISS index
+
+The index is built and saved once (VectorStore.save_mmap); every worker
+process opens it with FAISS mmap, so vectors and chunk texts live in the
+shared page cache instead of one private copy per process. Each worker
+runs whole graph executions on its own core, sidestepping the GIL.
+
+Usage:
+    python -m src.serving.workers build
+    python -m src.serving.workers bench --workers 4 --questions q.txt
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Optional, Union
+
+from src.config.config import Config
+
+
+# per-process graph, set by the pool initializer
+_graph = None
+
+
+def _init_worker(index_dir: str, workers: int):
+    global _graph
+    from src.graph_builder.graph_builder import GraphBuilder
+    from src.vectorstore.vectorstore import VectorStore
+
+    # every worker runs its own scheduler: give each an equal share of the
+    # provider limits so the pool as a whole stays within them
+    Config.LLM_RPM /= workers
+    Config.LLM_TPM /= workers
+    Config.EMBED_RPM /= workers
+    Config.EMBED_TPM /= workers
+
+    store = VectorStore.load_mmap(index_dir)
+    _graph = GraphBuilder(
+        retriever=store.get_retriever(),
+        llm=Config.get_llm("answer"),
+        judge_llm=Config.get_llm("judge"),
+        router=Config.get_router(),
+        route_logger=Config.get_route_logger(),
+    ).build()
+
+
+def _invoke(inputs: dict) -> dict:
+    return dict(_graph.invoke(inputs))
+
+
+class ServingPool:
+    """Pool of worker processes serving graph executions from a shared mmap index"""
+
+    def __init__(
+        self,
+        index_dir: Union[str, Path],
+        workers: Optional[int] = None,
+    ):
+        if not (Path(index_dir) / "index.faiss").exists():
+            raise ValueError(
+                f"No saved index in {index_dir}. Run: python -m src.serving.workers build"
+            )
+
+        self.workers = workers or os.cpu_count()
+        # spawn: workers must not inherit threads / sockets from the parent
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(str(index_dir), self.workers),
+        )
+
+    def invoke(self, inputs: dict, **kwargs) -> dict:
+        return self._pool.submit(_invoke, inputs).result()
+
+    async def ainvoke(self, inputs: dict, **kwargs) -> dict:
+        return await asyncio.wrap_future(self._pool.submit(_invoke, inputs))
+
+    def map(self, questions: List[str]):
+        """Yield results as they complete"""
+        futures = [self._pool.submit(_invoke, {"question": q}) for q in questions]
+        for future in as_completed(futures):
+            yield future.result()
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def build_index(index_dir: Union[str, Path]):
+    """Ingest the default corpus once and save it in the mmap layout"""
+    from src.clients.scheduler import priority_scope
+    from src.doc_ingestion.doc_processor import DocumentProcessor
+    from src.vectorstore.vectorstore import VectorStore
+
+    doc_processor = DocumentProcessor(
+        chunk_size=Config.CHUNK_SIZE,
+        chunk_overlap=Config.CHUNK_OVERLAP,
+    )
+    vector_store = VectorStore()
+
+    with priority_scope("ingest"):
+        documents, spans = doc_processor.process_urls_to_spans(Config.DEFAULT_URLS)
+        vector_store.create_vectorstore_from_spans(documents, spans)
+
+    vector_store.save_mmap(index_dir)
+    print(f"Saved {len(spans)} chunks to {index_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-process mmap serving")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("build", help="build and save the serving index")
+
+    bench = sub.add_parser("bench", help="run a question log through the worker pool")
+    bench.add_argument("--workers", type=int, default=Config.SERVING_WORKERS or None)
+    bench.add_argument("--questions", help="question log (.txt or .jsonl)")
+
+    parser.add_argument("--index-dir", default=Config.SERVING_INDEX_DIR)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build_index(args.index_dir)
+        return
+
+    from src.eval.load_test import load_questions
+
+    questions = load_questions(args.questions)
+    with ServingPool(args.index_dir, workers=args.workers) as pool:
+        start = time.perf_counter()
+        done = sum(1 for _ in pool.map(questions))
+        elapsed = time.perf_counter() - start
+
+    print(f"Workers: {pool.workers}")
+    print(f"Completed: {done} in {elapsed:.2f}s ({done / elapsed:.2f} req/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,8 +12,17 @@ class RAGState(BaseModel):
     answer: str = ""
     use_web: bool = False
 
+    # latency budget: absolute time.time() deadline (set on entry if missing)
+    deadline: Optional[float] = None
+
+    # routing features
+    question_embedding: List[float] = []
+    retrieval_scores: List[float] = []
+
     # 🔍 debug / observability
     debug_retrieved_count: int = 0
     debug_judge_decision: Optional[str] = None
+    debug_router_source: Optional[str] = None
     debug_web_raw: Optional[str] = None
     debug_web_context: Optional[str] = None
+    debug_degraded: List[str] = []
@@ -0,0 +1,126 @@
+"""Short-lived index for ranking web search results against the question"""
+
+import hashlib
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.clients.scheduler import estimate_tokens
+from src.doc_ingestion.span_splitter import SpanSplitter, span_text
+
+
+class EphemeralWebIndex:
+    """
+    Chunks web results, embeds them and keeps only the best ones
+
+    Chunk embeddings are shared across requests for `ttl` seconds, so a
+    page returned for several questions in a burst is embedded once.
+    """
+
+    def __init__(
+        self,
+        embeddings,
+        chunk_size: int = 500,
+        chunk_overlap: int = 50,
+        ttl: float = 600.0,
+        max_entries: int = 5000,
+    ):
+        self.embeddings = embeddings
+        self.splitter = SpanSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Tuple[float, np.ndarray]] = {}
+
+    def _chunks(self, results: List[dict]) -> List[Document]:
+        """Split every result's content into chunk Documents"""
+        pages = [
+            Document(
+                page_content=r.get("content") or "",
+                metadata={"source": r.get("url", "web")},
+            )
+            for r in results
+        ]
+        return [
+            Document(
+                page_content=span_text(pages, sp),
+                metadata={"source": pages[sp.doc_id].metadata["source"]},
+            )
+            for sp in self.splitter.split_documents(pages)
+        ]
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts, reusing vectors cached within the TTL"""
+        now = time.monotonic()
+        keys = [hashlib.sha1(t.encode("utf-8")).hexdigest() for t in texts]
+        vectors: List[Optional[np.ndarray]] = [None] * len(texts)
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                hit = self._cache.get(key)
+                if hit is not None and hit[0] > now:
+                    vectors[i] = hit[1]
+
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        if missing:
+            fresh = self.embeddings.embed_documents([texts[i] for i in missing])
+            with self._lock:
+                self._evict(now)
+                for i, vec in zip(missing, fresh):
+                    vectors[i] = np.asarray(vec, dtype=np.float32)
+                    self._cache[keys[i]] = (now + self.ttl, vectors[i])
+
+        return np.stack(vectors)
+
+    def _evict(self, now: float):
+        """Drop expired entries, then the oldest ones if still over capacity"""
+        for key in [k for k, (exp, _) in self._cache.items() if exp <= now]:
+            del self._cache[key]
+        overflow = len(self._cache) - self.max_entries
+        if overflow > 0:
+            for key in sorted(self._cache, key=lambda k: self._cache[k][0])[:overflow]:
+                del self._cache[key]
+
+    def top_chunks(
+        self,
+        question: str,
+        results: List[dict],
+        token_budget: int,
+        query_embedding: Optional[Sequence[float]] = None,
+    ) -> List[Tuple[Document, float]]:
+        """
+        Highest-scoring web chunks that fit in the token budget
+
+        Args:
+            question: User question
+            results: Tavily `results` entries (content, url)
+            token_budget: Max estimated prompt tokens for the selected chunks
+            query_embedding: Reuse the retrieval embedding when available
+
+        Returns:
+            (chunk, cosine score) pairs, best first
+        """
+        chunks = self._chunks(results)
+        if not chunks:
+            return []
+
+        matrix = self._embed([c.page_content for c in chunks])
+        if query_embedding is None:
+            query_embedding = self.embeddings.embed_query(question)
+        q = np.asarray(query_embedding, dtype=np.float32)
+
+        norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(q) or 1.0)
+        scores = matrix @ q / np.where(norms == 0, 1.0, norms)
+
+        selected, used = [], 0
+        for i in np.argsort(-scores):
+            cost = estimate_tokens(chunks[i].page_content)
+            if used + cost > token_budget:
+                continue
+            selected.append((chunks[i], float(scores[i])))
+            used += cost
+        return selected
@@ -0,0 +1,157 @@
+"""Versioned index holder with read-copy-update hot swaps"""
+
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from langchain_core.documents import Document
+
+from src.vectorstore.vectorstore import VectorStore
+
+
+class _Version:
+    """One published index and the number of readers pinned to it"""
+
+    def __init__(self, store: VectorStore, version: int):
+        self.store = store
+        self.version = version
+        self.pins = 0
+
+
+class IndexHolder:
+    """
+    Holds the live VectorStore and swaps in rebuilt ones atomically
+
+    Readers pin the current version for the duration of a search; swap()
+    only replaces the pointer, so in-flight searches finish on the old
+    index, new ones see the new index, and the old one is released once
+    its last reader unpins.
+    """
+
+    def __init__(self, on_retire: Optional[Callable[[VectorStore], None]] = None):
+        self.on_retire = on_retire
+
+        self._lock = threading.Lock()
+        self._current: Optional[_Version] = None
+        self._retired: Dict[int, _Version] = {}
+        self._next_version = 1
+
+    def swap(self, store: VectorStore) -> int:
+        """Publish a fully built store; returns its version"""
+        store.get_retriever()  # refuse half-initialised stores
+
+        with self._lock:
+            old = self._current
+            self._current = _Version(store, self._next_version)
+            self._next_version += 1
+
+            drained = None
+            if old is not None:
+                if old.pins == 0:
+                    drained = old
+                else:
+                    self._retired[old.version] = old
+            version = self._current.version
+
+        if drained is not None:
+            self._retire(drained)
+        return version
+
+    @contextmanager
+    def pin(self) -> Iterator[VectorStore]:
+        """Use the current store; it stays alive until the block exits"""
+        with self.pin_version() as (store, _):
+            yield store
+
+    @contextmanager
+    def pin_version(self) -> Iterator[Tuple[VectorStore, int]]:
+        """Like pin(), also yielding the pinned version number"""
+        with self._lock:
+            entry = self._current
+            if entry is None:
+                raise ValueError("No index published yet. Call swap first.")
+            entry.pins += 1
+
+        try:
+            yield entry.store, entry.version
+        finally:
+            drained = False
+            with self._lock:
+                entry.pins -= 1
+                if entry is not self._current and entry.pins == 0:
+                    self._retired.pop(entry.version, None)
+                    drained = True
+            if drained:
+                self._retire(entry)
+
+    def _retire(self, entry: _Version):
+        if self.on_retire is not None:
+            self.on_retire(entry.store)
+        entry.store = None
+
+    @property
+    def version(self) -> int:
+        """Version currently served (0 before the first swap)"""
+        with self._lock:
+            return self._current.version if self._current is not None else 0
+
+    @property
+    def ready(self) -> bool:
+        with self._lock:
+            return self._current is not None
+
+    def current(self) -> Optional[VectorStore]:
+        """Current store without pinning (for callers that own its lifetime)"""
+        with self._lock:
+            return self._current.store if self._current is not None else None
+
+    def current_version(self) -> Tuple[Optional[VectorStore], int]:
+        """(current store, its version) read atomically; (None, 0) before the first swap"""
+        with self._lock:
+            if self._current is None:
+                return None, 0
+            return self._current.store, self._current.version
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "version": self._current.version if self._current else 0,
+                "readers": self._current.pins if self._current else 0,
+                "draining": {v: e.pins for v, e in self._retired.items()},
+            }
+
+
+def _stamp(doc: Document, version: int) -> Document:
+    """Copy of a retrieved chunk tagged with the index version it came from"""
+    # copy: the docstore hands out its own Document objects
+    return Document(
+        page_content=doc.page_content,
+        metadata={**doc.metadata, "index_version": version},
+    )
+
+
+class HolderRetriever:
+    """
+    Retriever that pins the holder's current index for each search
+
+    Returned chunks carry `index_version`, so offsets in their metadata
+    are only resolved against the store they were retrieved from.
+    """
+
+    def __init__(self, holder: IndexHolder, k: int = 4):
+        self.holder = holder
+        self.search_kwargs = {"k": k}
+
+    def invoke(self, query: str):
+        with self.holder.pin_version() as (store, version):
+            docs = store.get_retriever().invoke(query)
+        return [_stamp(d, version) for d in docs]
+
+    def search_with_scores(self, query: str, k: Optional[int] = None):
+        """Embed once and search, returning (embedding, [(doc, score)])"""
+        k = k or self.search_kwargs["k"]
+        with self.holder.pin_version() as (store, version):
+            vs = store.get_retriever().vectorstore
+            embedding = vs.embeddings.embed_query(query)
+            scored = vs.similarity_search_with_score_by_vector(embedding, k=k)
+        return embedding, [(_stamp(d, version), s) for d, s in scored]
@@ -0,0 +1,172 @@
+"""Read-only, memory-mapped FAISS index + docstore shared by serving processes"""
+
+import json
+import mmap
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import List, Tuple, Union
+
+import faiss
+import numpy as np
+from langchain_community.docstore.base import Docstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+
+INDEX_FILE = "index.faiss"
+TEXTS_FILE = "texts.bin"
+TEXT_OFFSETS_FILE = "texts.idx.npy"
+META_FILE = "meta.bin"
+META_OFFSETS_FILE = "meta.idx.npy"
+SOURCES_FILE = "sources.bin"
+SOURCE_OFFSETS_FILE = "sources.idx.npy"
+SOURCE_META_FILE = "sources_meta.bin"
+SOURCE_META_OFFSETS_FILE = "sources_meta.idx.npy"
+
+# flat indexes need IO_FLAG_MMAP_IFC to be mapped instead of copied
+_MMAP_FLAGS = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+
+
+def _write_blobs(path: Path, offsets_path: Path, blobs):
+    """Concatenate byte blobs into one file plus an int64 offsets array"""
+    offsets = [0]
+    with path.open("wb") as f:
+        for blob in blobs:
+            f.write(blob)
+            offsets.append(offsets[-1] + len(blob))
+    np.save(offsets_path, np.asarray(offsets, dtype=np.int64))
+
+
+def save_mmap(
+    vectorstore: FAISS,
+    directory: Union[str, Path],
+    documents: List[Document] = (),
+):
+    """
+    Write a FAISS vectorstore in the mmap-able layout
+
+    Position i in the FAISS index maps to text/metadata record i; the
+    source documents chunk metadata points into (doc_id) are saved too.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    ids = [vectorstore.index_to_docstore_id[i] for i in range(vectorstore.index.ntotal)]
+    docs = [vectorstore.docstore.search(_id) for _id in ids]
+
+    faiss.write_index(vectorstore.index, str(directory / INDEX_FILE))
+    _write_blobs(
+        directory / TEXTS_FILE,
+        directory / TEXT_OFFSETS_FILE,
+        (d.page_content.encode("utf-8") for d in docs),
+    )
+    _write_blobs(
+        directory / META_FILE,
+        directory / META_OFFSETS_FILE,
+        (json.dumps(d.metadata).encode("utf-8") for d in docs),
+    )
+    _write_blobs(
+        directory / SOURCES_FILE,
+        directory / SOURCE_OFFSETS_FILE,
+        (d.page_content.encode("utf-8") for d in documents),
+    )
+    _write_blobs(
+        directory / SOURCE_META_FILE,
+        directory / SOURCE_META_OFFSETS_FILE,
+        (json.dumps(d.metadata).encode("utf-8") for d in documents),
+    )
+
+
+class _Blobs:
+    """Random access to records in a memory-mapped blob file"""
+
+    def __init__(self, path: Path, offsets_path: Path):
+        self.offsets = np.load(offsets_path, mmap_mode="r")
+        self._file = path.open("rb")
+        size = path.stat().st_size
+        # mmap of an empty file is not allowed
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> bytes:
+        return self._map[int(self.offsets[i]):int(self.offsets[i + 1])]
+
+
+class _MappedDocuments(Sequence):
+    """Documents decoded on access from a pair of mapped text / metadata files"""
+
+    def __init__(self, texts: _Blobs, metas: _Blobs):
+        self.texts = texts
+        self.metas = metas
+
+    def __len__(self):
+        return len(self.texts)
+
+    def __getitem__(self, i: int) -> Document:
+        if not 0 <= i < len(self.texts):
+            raise IndexError(i)
+        return Document(
+            page_content=self.texts[i].decode("utf-8"),
+            metadata=json.loads(self.metas[i]),
+        )
+
+
+class MmapDocstore(Docstore):
+    """Docstore reading chunk text and metadata straight from mapped files"""
+
+    def __init__(self, directory: Path):
+        self.chunks = _MappedDocuments(
+            _Blobs(directory / TEXTS_FILE, directory / TEXT_OFFSETS_FILE),
+            _Blobs(directory / META_FILE, directory / META_OFFSETS_FILE),
+        )
+
+    def search(self, search: str) -> Union[str, Document]:
+        i = int(search)
+        if not 0 <= i < len(self.chunks):
+            return f"ID {search} not found."
+        return self.chunks[i]
+
+
+class _PositionIds(Mapping):
+    """index position -> docstore id without materialising a dict per process"""
+
+    def __init__(self, n: int):
+        self.n = n
+
+    def __getitem__(self, i: int) -> str:
+        if not 0 <= i < self.n:
+            raise KeyError(i)
+        return str(i)
+
+    def __iter__(self):
+        return iter(range(self.n))
+
+    def __len__(self):
+        return self.n
+
+
+def load_mmap(directory: Union[str, Path], embedding) -> Tuple[FAISS, Sequence]:
+    """
+    Open a saved index read-only; vectors and texts stay in the page cache
+
+    Returns:
+        (vectorstore, source documents)
+    """
+    directory = Path(directory)
+    index = faiss.read_index(str(directory / INDEX_FILE), _MMAP_FLAGS)
+    vectorstore = FAISS(
+        embedding_function=embedding,
+        index=index,
+        docstore=MmapDocstore(directory),
+        index_to_docstore_id=_PositionIds(index.ntotal),
+    )
+
+    documents = []
+    if (directory / SOURCES_FILE).exists():
+        documents = _MappedDocuments(
+            _Blobs(directory / SOURCES_FILE, directory / SOURCE_OFFSETS_FILE),
+            _Blobs(directory / SOURCE_META_FILE, directory / SOURCE_META_OFFSETS_FILE),
+        )
+    return vectorstore, documents
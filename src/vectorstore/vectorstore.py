@@ -50,24 +50,134 @@
 #             raise ValueError("Vector store not initialized. Call create_vectorstore first.")
 #         return self.retriever.invoke(query)
 
-from typing import List
+from typing import List, Sequence
+import faiss
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
-from langchain_openai import OpenAIEmbeddings
 from langchain_core.documents import Document
 
+from src.config.config import Config
+from src.doc_ingestion.span_splitter import Span, expand_span, span_metadata, span_text
+from src.vectorstore.mmap_store import load_mmap, save_mmap
+
 
 class VectorStore:
     """Manages vector store embeddings and retrieval"""
 
     def __init__(self):
-        self.embedding = OpenAIEmbeddings()
+        self.embedding = Config.get_clients().embeddings()
         self.vectostore = None
         self.retriever = None
+        self.version = 0
+        # source documents span metadata points into (doc_id == position)
+        self.documents: Sequence[Document] = []
 
     def create_vectorstore(self, documents: List[Document]):
         """Create vector store from documents"""
         self.vectostore = FAISS.from_documents(documents, self.embedding)
         self.retriever = self.vectostore.as_retriever()
+        self.version += 1
+
+    def create_vectorstore_from_spans(
+        self,
+        documents: List[Document],
+        spans: List[Span],
+        batch_size: int = 256,
+    ):
+        """
+        Create vector store from spans, slicing chunk text one batch at a time
+
+        The source documents are kept in self.documents, so a retrieved
+        chunk's doc_id / start / end metadata can be mapped back to its
+        source text (see expand). Calling this again appends.
+
+        Args:
+            documents: Source documents the spans point into
+            spans: Chunks as (doc_id, start, end) offsets
+            batch_size: Spans sliced and embedded per batch
+        """
+        if not spans:
+            raise ValueError("No spans to index.")
+
+        # rebase doc_ids onto the store-wide document list
+        # (append-only, so snapshots sharing the list stay valid)
+        if not isinstance(self.documents, list):
+            self.documents = list(self.documents)
+        offset = len(self.documents)
+        self.documents.extend(documents)
+        spans = [Span(sp.doc_id + offset, sp.start, sp.end) for sp in spans]
+
+        for i in range(0, len(spans), batch_size):
+            batch = spans[i:i + batch_size]
+            texts = [span_text(self.documents, sp) for sp in batch]
+            metadatas = [span_metadata(self.documents, sp) for sp in batch]
+
+            if self.vectostore is None:
+                self.vectostore = FAISS.from_texts(
+                    texts, self.embedding, metadatas=metadatas
+                )
+            else:
+                self.vectostore.add_texts(texts, metadatas=metadatas)
+
+        self.retriever = self.vectostore.as_retriever()
+        self.version += 1
+
+    def snapshot(self) -> "VectorStore":
+        """
+        Independent copy of the current index
+
+        The copy can be searched while this store keeps growing, since
+        FAISS does not support concurrent add and search on one index.
+        """
+        if self.vectostore is None:
+            raise ValueError("Vector store not initialized. Call create_vectorstore first.")
+
+        snap = VectorStore()
+        snap.vectostore = FAISS(
+            embedding_function=self.embedding,
+            index=faiss.clone_index(self.vectostore.index),
+            docstore=InMemoryDocstore(dict(self.vectostore.docstore._dict)),
+            index_to_docstore_id=dict(self.vectostore.index_to_docstore_id),
+        )
+        snap.retriever = snap.vectostore.as_retriever()
+        snap.version = self.version
+        snap.documents = self.documents
+        return snap
+
+    def expand(self, doc: Document, window: int) -> Document:
+        """
+        Retrieved chunk widened by `window` characters of its source text
+
+        The returned metadata carries the widened start / end; the
+        original chunk sits at [doc.start - new start, doc.end - new start)
+        inside it, for highlighting. Chunks without span metadata are
+        returned unchanged.
+        """
+        meta = doc.metadata
+        doc_id = meta.get("doc_id")
+        if doc_id is None or not 0 <= doc_id < len(self.documents):
+            return doc
+
+        span = expand_span(self.documents, Span(doc_id, meta["start"], meta["end"]), window)
+        return Document(
+            page_content=span_text(self.documents, span),
+            metadata={**meta, "start": span.start, "end": span.end},
+        )
+
+    def save_mmap(self, directory: str):
+        """Save the index in the read-only, memory-mappable serving layout"""
+        if self.vectostore is None:
+            raise ValueError("Vector store not initialized. Call create_vectorstore first.")
+        save_mmap(self.vectostore, directory, self.documents)
+
+    @classmethod
+    def load_mmap(cls, directory: str) -> "VectorStore":
+        """Open an index saved with save_mmap; pages are shared across processes"""
+        store = cls()
+        store.vectostore, store.documents = load_mmap(directory, store.embedding)
+        store.retriever = store.vectostore.as_retriever()
+        store.version = 1
+        return store
 
     def get_retriever(self):
         """Get the retriever instance"""
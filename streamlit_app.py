@@ -2,7 +2,9 @@
 
 import streamlit as st
 from pathlib import Path
+import html
 import sys
+import threading
 import time
 
 from dotenv import load_dotenv
@@ -13,8 +15,11 @@ sys.path.append(str(Path(__file__).parent))
 
 from src.config.config import Config
 from src.doc_ingestion.doc_processor import DocumentProcessor
-from src.vectorstore.vectorstore import VectorStore
 from src.graph_builder.graph_builder import GraphBuilder
+from src.serving.singleflight import CoalescedGraph
+from src.serving.warmup import BackgroundIndexer
+from src.vectorstore.index_holder import IndexHolder, HolderRetriever
+from src.clients.scheduler import AdmissionError
 
 
 # page config
@@ -43,6 +48,8 @@ st.markdown(
 def init_session_state():
     if "rag_graph" not in st.session_state:
         st.session_state.rag_graph = None
+    if "service" not in st.session_state:
+        st.session_state.service = None
     if "initialized" not in st.session_state:
         st.session_state.initialized = False
     if "history" not in st.session_state:
@@ -51,28 +58,90 @@ def init_session_state():
 
 @st.cache_resource
 def initialize_rag():
-    llm = Config.get_llm()
+    llm = Config.get_llm("answer")
 
     doc_processor = DocumentProcessor(
         chunk_size=Config.CHUNK_SIZE,
         chunk_overlap=Config.CHUNK_OVERLAP
     )
 
-    vector_store = VectorStore()
+    # live index; rebuilt indexes are hot-swapped in without a restart
+    holder = IndexHolder()
 
-    documents = doc_processor.process_urls(
-        Config.DEFAULT_URLS
-    )
-
-    vector_store.create_vectorstore(documents)
+    # index in the background; queries use the latest published snapshot
+    indexer = BackgroundIndexer(
+        doc_processor,
+        Config.DEFAULT_URLS,
+        batch_size=Config.WARMUP_BATCH_SIZE,
+        holder=holder
+    ).start()
 
     graph_builder = GraphBuilder(
-        retriever=vector_store.get_retriever(),
-        llm=llm
+        retriever=HolderRetriever(holder),
+        llm=llm,
+        judge_llm=Config.get_llm("judge"),
+        router=Config.get_router(),
+        route_logger=Config.get_route_logger()
+    )
+
+    # shared across sessions: identical concurrent questions run once
+    rag_graph = CoalescedGraph(
+        graph_builder.build(),
+        index_version=lambda: holder.version
     )
 
-    rag_graph = graph_builder.build()
-    return rag_graph, len(documents)
+    # shared across sessions so only one rebuild runs at a time
+    service = {
+        "doc_processor": doc_processor,
+        "holder": holder,
+        "indexer": indexer,
+        "lock": threading.Lock(),
+    }
+    return rag_graph, service
+
+
+def rebuild_index(service):
+    """Re-crawl on the side and swap the finished index in atomically"""
+    with service["lock"]:
+        if not service["indexer"].done:
+            return False
+
+        service["indexer"] = BackgroundIndexer(
+            service["doc_processor"],
+            Config.DEFAULT_URLS,
+            batch_size=Config.WARMUP_BATCH_SIZE,
+            holder=service["holder"],
+            progressive=False
+        ).start()
+        return True
+
+
+@st.fragment(run_every=1.0)
+def index_status(service):
+    indexer = service["indexer"]
+    progress = indexer.progress()
+
+    if progress["error"]:
+        st.error(f"❌ Indexing failed: {progress['error']}")
+    elif progress["done"]:
+        st.success(
+            f"✅ System ready ({progress['chunks']} document chunks indexed)"
+        )
+    else:
+        total = max(progress["sources_total"], 1)
+        st.progress(
+            progress["sources_done"] / total,
+            text=(
+                f"Indexing {progress['sources_done']}/{progress['sources_total']} "
+                f"sources ({progress['chunks']} chunks)"
+            )
+        )
+        if progress["ready"] and not indexer.progressive:
+            st.caption("Rebuilding index; answering from the current version.")
+        elif progress["ready"]:
+            st.caption("Answering from the documents indexed so far.")
+        else:
+            st.caption("Warming up: first batch of documents is being indexed...")
 
 
 def main():
@@ -82,13 +151,21 @@ def main():
     st.markdown("Docs first. Web fallback only if needed.")
 
     if not st.session_state.initialized:
-        with st.spinner("Loading system..."):
-            rag_graph, num_chunks = initialize_rag()
-            st.session_state.rag_graph = rag_graph
-            st.session_state.initialized = True
-            st.success(
-                f"✅ System ready ({num_chunks} document chunks indexed)"
-            )
+        rag_graph, service = initialize_rag()
+        st.session_state.rag_graph = rag_graph
+        st.session_state.service = service
+        st.session_state.initialized = True
+
+    index_status(st.session_state.service)
+
+    with st.sidebar:
+        st.markdown("### 🗂️ Index")
+        if st.button("🔄 Rebuild index"):
+            if rebuild_index(st.session_state.service):
+                st.info("Rebuilding in the background; it will be swapped in when done.")
+            else:
+                st.warning("Indexing already in progress.")
+        st.caption(f"Serving index v{st.session_state.service['holder'].version}")
 
     st.markdown("---")
 
@@ -99,13 +176,20 @@ def main():
         )
         submit = st.form_submit_button("🔍 Search")
 
-    if submit and question and st.session_state.rag_graph:
+    if submit and question and not st.session_state.service["holder"].ready:
+        st.warning("⏳ Still indexing the first batch of documents, please retry in a moment.")
+
+    elif submit and question and st.session_state.rag_graph:
         with st.spinner("Thinking..."):
             start_time = time.time()
 
-            result = st.session_state.rag_graph.invoke(
-                {"question": question}
-            )
+            try:
+                result = st.session_state.rag_graph.invoke(
+                    {"question": question}
+                )
+            except AdmissionError as e:
+                st.error(f"⏳ System busy, please retry shortly ({e})")
+                st.stop()
 
             elapsed = time.time() - start_time
 
@@ -122,13 +206,34 @@ def main():
                 st.caption("📄 Answered from documents")
 
             if docs:
+                store, version = st.session_state.service["holder"].current_version()
                 with st.expander("📄 Source Documents"):
                     for i, doc in enumerate(docs, 1):
-                        st.text_area(
-                            f"Document {i}",
-                            doc.page_content[:300] + "...",
-                            height=100,
-                            disabled=True
+                        meta = doc.metadata
+                        st.markdown(
+                            f"**Document {i}:** {meta.get('title') or meta.get('source', '')}"
+                        )
+                        # offsets are only valid in the index version they came from
+                        if (
+                            store is None
+                            or "start" not in meta
+                            or meta.get("index_version") != version
+                        ):
+                            st.caption(doc.page_content[:300] + "...")
+                            continue
+
+                        # retrieved chunk highlighted inside its surrounding source text
+                        context = store.expand(doc, 200)
+                        lo = meta["start"] - context.metadata["start"]
+                        hi = meta["end"] - context.metadata["start"]
+                        text = context.page_content
+                        before, chunk, after = (
+                            html.escape(t).replace("\n", "<br>")
+                            for t in (text[:lo], text[lo:hi], text[hi:])
+                        )
+                        st.markdown(
+                            f"<div>…{before}<mark>{chunk}</mark>{after}…</div>",
+                            unsafe_allow_html=True
                         )
 
             st.caption(f"⏱️ Response time: {elapsed:.2f}s")
@@ -137,7 +242,13 @@ def main():
             with st.expander("🪵 Debug logs"):
                 st.write("Retrieved docs count:", result.get("debug_retrieved_count"))
                 st.write("Judge decision:", result.get("debug_judge_decision"))
+                st.write("Routed by:", result.get("debug_router_source"))
                 st.write("Used web:", used_web)
+                st.write("Degraded:", result.get("debug_degraded") or "no")
+                st.write("Hedging:", Config.get_hedger().stats())
+                st.write("Coalesced executions:", st.session_state.rag_graph.stats())
+                st.write("Index versions:", st.session_state.service["holder"].stats())
+                st.write("Connection pools:", Config.get_clients().stats())
 
                 if used_web:
                     st.write("Raw Tavily response:")